@@ -5,15 +5,28 @@ set -o errexit
 echo "Installing dependencies..."
 pip install -r requirements.txt
 
+echo "Building Tailwind CSS bundle..."
+npm install --no-audit --no-fund
+npm run build:css
+
 echo "Creating staticfiles directory..."
 mkdir -p staticfiles
 
 echo "Collecting static files..."
 python manage.py collectstatic --no-input
 
+echo "Checking the deployment (fails if the CSS bundle is missing)..."
+python manage.py check --deploy --fail-level ERROR
+
 echo "Running migrations..."
 python manage.py migrate
 
+echo "Rebuilding analytics rollup..."
+python manage.py rebuild_analytics
+
+echo "Rebuilding search suggestion index..."
+python manage.py rebuild_search_index --if-empty
+
 echo "Creating sample data..."
 python manage.py create_sample_data || echo "Sample data creation failed or already exists"
 
@@ -81,10 +81,102 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests (seconds) so a worker's
+        # connection, opened right after it starts, is reused
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
 
+# Events that started more than this many days ago are moved to the
+# archive tables by `python manage.py archive_events`
+EVENT_ARCHIVE_AFTER_DAYS = int(os.environ.get('EVENT_ARCHIVE_AFTER_DAYS', '90'))
+
+# Category/event deletes remove dependents in batches of this size, and
+# cascades larger than the threshold are queued for `run_deletion_jobs`
+CHUNKED_DELETE_BATCH_SIZE = int(os.environ.get('CHUNKED_DELETE_BATCH_SIZE', '500'))
+CHUNKED_DELETE_BACKGROUND_THRESHOLD = int(os.environ.get('CHUNKED_DELETE_BACKGROUND_THRESHOLD', '5000'))
+
+
+# Cache
+# Feed stamps, the reference-data version and the suggestion index version
+# are invalidated from whichever process made the write, so every process
+# must see the same cache. Set REDIS_URL in production; otherwise the cache
+# lives in files under CACHE_DIR, shared by all processes on this host.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', BASE_DIR / '.cache'),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# /health/ready/ caches its SELECT 1 + migration check for this many seconds,
+# and /metrics/ caches event totals for METRICS_CACHE_TTL seconds
+HEALTH_DB_TIMEOUT = float(os.environ.get('HEALTH_DB_TIMEOUT', '2'))
+HEALTH_READINESS_CACHE_TTL = int(os.environ.get('HEALTH_READINESS_CACHE_TTL', '10'))
+METRICS_CACHE_TTL = int(os.environ.get('METRICS_CACHE_TTL', '60'))
+
+# /events/suggest/ caches results per prefix until the suggestion index changes
+SUGGEST_CACHE_TTL = int(os.environ.get('SUGGEST_CACHE_TTL', '300'))
+
+# Recurring events are expanded on demand; a date search without an end date
+# (and the event page) looks this many days ahead
+RECURRENCE_WINDOW_DAYS = int(os.environ.get('RECURRENCE_WINDOW_DAYS', '90'))
+
+# The change feed holds back entries younger than this, so a transaction
+# that committed late with a lower id is not skipped by consumers
+CHANGE_FEED_SETTLE_SECONDS = int(os.environ.get('CHANGE_FEED_SETTLE_SECONDS', '2'))
+
+# `python manage.py compact_changes` drops superseded change feed entries
+# older than this many days
+CHANGE_FEED_COMPACT_AFTER_DAYS = int(os.environ.get('CHANGE_FEED_COMPACT_AFTER_DAYS', '7'))
+
+
+# Sessions and flash messages
+# 'cookie' keeps both in signed cookies and 'cache' keeps sessions in the
+# cache above, so neither touches the database on CRUD requests. 'db' is
+# Django's default database-backed sessions.
+
+SESSION_PROFILE = os.environ.get('SESSION_PROFILE', 'db' if DEBUG else 'cookie')
+
+if SESSION_PROFILE == 'cookie':
+    SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+    MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+elif SESSION_PROFILE == 'cache':
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+    MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+
+# Email and participant notifications
+# Event changes/cancellations are queued and sent by
+# `python manage.py send_notifications`, NOTIFICATION_BATCH_SIZE messages per
+# SMTP connection and at most NOTIFICATION_RATE_LIMIT messages per second.
+# Edits to the same event within NOTIFICATION_DEBOUNCE_SECONDS are merged.
+
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False') == 'True'
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'events@localhost')
+
+NOTIFICATION_BATCH_SIZE = int(os.environ.get('NOTIFICATION_BATCH_SIZE', '100'))
+NOTIFICATION_RATE_LIMIT = float(os.environ.get('NOTIFICATION_RATE_LIMIT', '10'))
+NOTIFICATION_DEBOUNCE_SECONDS = int(os.environ.get('NOTIFICATION_DEBOUNCE_SECONDS', '60'))
+
+
 # Password validation
 
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -131,7 +223,12 @@ static_dir = BASE_DIR / 'static'
 if os.path.exists(static_dir):
     STATICFILES_DIRS = [static_dir]
 
-# WhiteNoise configuration for serving static files in production
+# WhiteNoise configuration for serving static files in production.
+# collectstatic writes content-hashed names (css/app.<hash>.css) plus .gz and,
+# with Brotli installed, .br copies; WhiteNoise serves hashed files with
+# far-future immutable cache headers. static/css/app.css itself is built from
+# static/src/tailwind.css by `npm run build:css` (see build.sh); until it is
+# built, base.html falls back to the Tailwind CDN compiler when DEBUG is on.
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Default primary key field type
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Category, Event, Participant
+from .models import (
+    ArchivedEvent, ArchiveRollup, Category, ChangeEntry, DailyCategoryStats, DeletionJob, Event, EventOccurrenceOverride,
+    NotificationJob, OccurrenceRegistration, Participant, SuggestionTerm,
+)
 
 
 @admin.register(Category)
@@ -11,11 +14,11 @@ class CategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ['name', 'date', 'time', 'location', 'category']
+    list_display = ['name', 'date', 'time', 'ends_at', 'recurrence_rule', 'location', 'category']
     list_filter = ['category', 'date']
     search_fields = ['name', 'location', 'description']
-    ordering = ['date', 'time']
-    date_hierarchy = 'date'
+    ordering = ['starts_at']
+    date_hierarchy = 'starts_at'
 
 
 @admin.register(Participant)
@@ -28,3 +31,70 @@ class ParticipantAdmin(admin.ModelAdmin):
     def event_count(self, obj):
         return obj.events.count()
     event_count.short_description = 'Number of Events'
+
+
+@admin.register(ArchivedEvent)
+class ArchivedEventAdmin(admin.ModelAdmin):
+    list_display = ['name', 'date', 'time', 'location', 'category', 'archived_at']
+    list_filter = ['category']
+    search_fields = ['name', 'location']
+    ordering = ['starts_at']
+    date_hierarchy = 'starts_at'
+
+
+@admin.register(ArchiveRollup)
+class ArchiveRollupAdmin(admin.ModelAdmin):
+    list_display = ['day', 'event_count', 'registration_count']
+    ordering = ['-day']
+
+
+@admin.register(DeletionJob)
+class DeletionJobAdmin(admin.ModelAdmin):
+    list_display = ['label', 'target', 'status', 'deleted', 'total', 'created_at']
+    list_filter = ['status', 'target']
+    ordering = ['-created_at']
+
+
+@admin.register(DailyCategoryStats)
+class DailyCategoryStatsAdmin(admin.ModelAdmin):
+    list_display = ['day', 'category', 'events_scheduled', 'registrations_added', 'registrations_removed', 'active_participants']
+    list_filter = ['category']
+    date_hierarchy = 'day'
+    ordering = ['-day']
+
+
+@admin.register(NotificationJob)
+class NotificationJobAdmin(admin.ModelAdmin):
+    list_display = ['event_id', 'kind', 'status', 'sent', 'run_after', 'created_at']
+    list_filter = ['status', 'kind']
+    ordering = ['-created_at']
+
+
+@admin.register(SuggestionTerm)
+class SuggestionTermAdmin(admin.ModelAdmin):
+    list_display = ['token', 'text', 'kind', 'event_count']
+    list_filter = ['kind']
+    search_fields = ['token', 'text']
+
+
+@admin.register(EventOccurrenceOverride)
+class EventOccurrenceOverrideAdmin(admin.ModelAdmin):
+    list_display = ['event', 'original_start', 'cancelled', 'starts_at', 'location']
+    list_filter = ['cancelled']
+    raw_id_fields = ['event']
+    ordering = ['original_start']
+
+
+@admin.register(OccurrenceRegistration)
+class OccurrenceRegistrationAdmin(admin.ModelAdmin):
+    list_display = ['participant', 'event', 'occurrence_start', 'created_at']
+    raw_id_fields = ['participant', 'event']
+    ordering = ['occurrence_start']
+
+
+@admin.register(ChangeEntry)
+class ChangeEntryAdmin(admin.ModelAdmin):
+    list_display = ['id', 'entity', 'key', 'action', 'created_at']
+    list_filter = ['entity', 'action']
+    search_fields = ['key']
+    ordering = ['-id']
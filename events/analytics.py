@@ -0,0 +1,144 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from .models import ArchivedEvent, DailyCategoryStats, Event
+
+
+STAT_FIELDS = ['events_scheduled', 'registrations_added', 'registrations_removed', 'active_participants']
+
+
+def _bump(day, category_id, **deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    DailyCategoryStats.objects.get_or_create(day=day, category_id=category_id)
+    DailyCategoryStats.objects.filter(day=day, category_id=category_id).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+def event_scheduled(starts_at, category_id, sign=1, registrations=0):
+    """Count an event (and the registrations it holds) in or out of its day"""
+    _bump(
+        timezone.localdate(starts_at), category_id,
+        events_scheduled=sign, active_participants=sign * registrations,
+    )
+
+
+def event_removed(event_id):
+    """Roll up an event deleted without model signals"""
+    row = Event.objects.filter(id=event_id).values('starts_at', 'category_id').first()
+    if row:
+        registrations = Event.participants.through.objects.filter(event_id=event_id).count()
+        event_scheduled(row['starts_at'], row['category_id'], -1, registrations)
+
+
+def registrations_changed(events, sign):
+    """Record registrations added (sign=1) or removed (sign=-1).
+
+    ``events`` maps ``(starts_at, category_id)`` to a registration count.
+    """
+    today = timezone.localdate()
+    per_category = Counter()
+    for (starts_at, category_id), count in events.items():
+        _bump(timezone.localdate(starts_at), category_id, active_participants=sign * count)
+        per_category[category_id] += count
+    for category_id, count in per_category.items():
+        if sign > 0:
+            _bump(today, category_id, registrations_added=count)
+        else:
+            _bump(today, category_id, registrations_removed=count)
+
+
+def event_keys(event_ids):
+    rows = Event.objects.filter(id__in=event_ids).values_list('starts_at', 'category_id')
+    return Counter(rows)
+
+
+def rebuild():
+    """Recompute events_scheduled and active_participants from the event and
+    archive tables. Registration add/remove history has no source table, so
+    those columns are kept as they are."""
+    scheduled = Counter()
+    active = Counter()
+    for model in (Event, ArchivedEvent):
+        rows = (
+            model.objects.annotate(day=TruncDate('starts_at'))
+            .values('day', 'category_id').annotate(n=Count('id')).order_by()
+        )
+        for row in rows:
+            scheduled[row['day'], row['category_id']] += row['n']
+        rows = (
+            model.participants.through.objects
+            .annotate(day=TruncDate(f'{model._meta.model_name}__starts_at'))
+            .values('day', f'{model._meta.model_name}__category_id').annotate(n=Count('id')).order_by()
+        )
+        for row in rows:
+            active[row['day'], row[f'{model._meta.model_name}__category_id']] += row['n']
+
+    with transaction.atomic():
+        DailyCategoryStats.objects.update(events_scheduled=0, active_participants=0)
+        existing = set(DailyCategoryStats.objects.values_list('day', 'category_id'))
+        keys = set(scheduled) | set(active)
+        DailyCategoryStats.objects.bulk_create([
+            DailyCategoryStats(day=day, category_id=category_id)
+            for day, category_id in keys - existing
+        ])
+        for day, category_id in keys:
+            DailyCategoryStats.objects.filter(day=day, category_id=category_id).update(
+                events_scheduled=scheduled[day, category_id],
+                active_participants=active[day, category_id],
+            )
+        DailyCategoryStats.objects.filter(
+            events_scheduled=0, active_participants=0, registrations_added=0, registrations_removed=0
+        ).delete()
+    return len(keys)
+
+
+def series(start=None, end=None, category_id=None, group='day'):
+    """Rollup totals per day (or ISO week), optionally for one category"""
+    queryset = DailyCategoryStats.objects.all()
+    if start:
+        queryset = queryset.filter(day__gte=start)
+    if end:
+        queryset = queryset.filter(day__lte=end)
+    if category_id:
+        queryset = queryset.filter(category_id=category_id)
+    period = TruncWeek('day') if group == 'week' else F('day')
+    return list(
+        queryset.annotate(period=period).values('period')
+        .annotate(**{field: Sum(field) for field in STAT_FIELDS})
+        .order_by('period')
+    )
+
+
+def category_totals(start=None, end=None):
+    queryset = DailyCategoryStats.objects.all()
+    if start:
+        queryset = queryset.filter(day__gte=start)
+    if end:
+        queryset = queryset.filter(day__lte=end)
+    return list(
+        queryset.values('category_id', 'category__name')
+        .annotate(**{field: Sum(field) for field in STAT_FIELDS})
+        .order_by('category__name')
+    )
+
+
+def recent_activity(days=14):
+    """Registrations added per day for the dashboard chart, zero-filled"""
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    totals = {row['period']: row for row in series(start, today)}
+    peak = max([row['registrations_added'] for row in totals.values()] + [1])
+    activity = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        added = totals[day]['registrations_added'] if day in totals else 0
+        activity.append({'day': day, 'added': added, 'percent': round(added * 100 / peak)})
+    return activity
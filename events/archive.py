@@ -0,0 +1,159 @@
+import heapq
+from collections import Counter
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Min, Sum
+from django.utils import timezone
+
+from . import outbox, search
+from .feeds import bump_events_stamp, forget_vevents
+from .models import ArchivedEvent, ArchiveRollup, ChangeEntry, Event
+
+
+ARCHIVED_FIELDS = [
+    'id', 'name', 'description', 'date', 'time', 'starts_at', 'ends_at', 'location',
+    'latitude', 'longitude', 'geohash', 'category_id',
+]
+
+
+def archive_cutoff(now=None):
+    """Events starting before this instant belong in the archive"""
+    days = getattr(settings, 'EVENT_ARCHIVE_AFTER_DAYS', 90)
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def archive_events(cutoff=None, batch_size=500):
+    """Move events older than ``cutoff`` (and their registrations) to the archive.
+
+    Each batch runs in its own short transaction so the hot table is never
+    locked for long. Returns the ``(events, registrations)`` moved.
+    """
+    cutoff = cutoff or archive_cutoff()
+    moved_events = moved_registrations = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                # Series keep their per-occurrence rows, so they stay hot
+                Event.objects.filter(starts_at__lt=cutoff, recurrence_rule='')
+                .order_by('starts_at')
+                .values(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            event_ids = [row['id'] for row in rows]
+
+            ArchivedEvent.objects.bulk_create([
+                ArchivedEvent(original_id=row['id'], **{k: v for k, v in row.items() if k != 'id'})
+                for row in rows
+            ])
+            archived_ids = dict(
+                ArchivedEvent.objects.filter(original_id__in=event_ids).values_list('original_id', 'id')
+            )
+
+            registrations = list(
+                Event.participants.through.objects.filter(event_id__in=event_ids)
+                .values_list('event_id', 'participant_id')
+            )
+            ArchivedEvent.participants.through.objects.bulk_create([
+                ArchivedEvent.participants.through(
+                    archivedevent_id=archived_ids[event_id], participant_id=participant_id
+                )
+                for event_id, participant_id in registrations
+            ])
+
+            per_event = Counter(event_id for event_id, _ in registrations)
+            update_rollup(rows, per_event)
+            Event.participants.through.objects.filter(event_id__in=event_ids)._raw_delete(Event.objects.db)
+            Event.objects.filter(id__in=event_ids)._raw_delete(Event.objects.db)
+            outbox.record_deleted(ChangeEntry.EVENT, event_ids, archived=True)
+            forget_vevents(*event_ids)
+            search.unindex_rows(rows)
+
+        moved_events += len(rows)
+        moved_registrations += len(registrations)
+    if moved_events:
+        bump_events_stamp()
+    return moved_events, moved_registrations
+
+
+def update_rollup(rows, per_event, sign=1):
+    """Count archived ``rows`` (dicts with id/starts_at) and their
+    registrations, ``per_event`` keyed by row id, in or out of the rollup"""
+    totals = {}
+    for row in rows:
+        day = timezone.localdate(row['starts_at'])
+        events, regs = totals.get(day, (0, 0))
+        totals[day] = (events + 1, regs + per_event.get(row['id'], 0))
+
+    for day, (events, regs) in totals.items():
+        ArchiveRollup.objects.get_or_create(day=day)
+        ArchiveRollup.objects.filter(day=day).update(
+            event_count=F('event_count') + sign * events,
+            registration_count=F('registration_count') + sign * regs,
+        )
+    if sign < 0:
+        ArchiveRollup.objects.filter(day__in=totals, event_count__lte=0).delete()
+
+
+def registrations_removed(starts_ats):
+    """Take registrations on archived events starting at ``starts_ats``
+    (one entry per registration) out of the rollup"""
+    for day, count in Counter(timezone.localdate(starts_at) for starts_at in starts_ats).items():
+        ArchiveRollup.objects.filter(day=day).update(registration_count=F('registration_count') - count)
+
+
+def archived_totals():
+    """Read archive counts from the rollup instead of the archive tables"""
+    totals = ArchiveRollup.objects.aggregate(
+        events=Sum('event_count'), registrations=Sum('registration_count'), last_day=Max('day')
+    )
+    totals['events'] = totals['events'] or 0
+    totals['registrations'] = totals['registrations'] or 0
+    return totals
+
+
+def reaches_archive(date_from=None, date_to=None):
+    """True if a list filter on [date_from, date_to] overlaps archived days.
+    Either end may be open, but an unfiltered list never reads the archive."""
+    if date_from is None and date_to is None:
+        return False
+    days = ArchiveRollup.objects.filter(event_count__gt=0).aggregate(first=Min('day'), last=Max('day'))
+    if days['last'] is None:
+        return False
+    return (date_from is None or date_from <= days['last']) and (date_to is None or date_to >= days['first'])
+
+
+class ArchiveAwareResults:
+    """Paginator-compatible merge of archived and hot events by ``starts_at``.
+
+    Hot rows can start before archived ones (recurring series keep their
+    first start, and past-dated events can be added at any time), so the
+    two querysets are merged rather than concatenated. A slice [start:stop)
+    reads at most ``stop`` rows from each. Ties go to the archived row.
+    """
+
+    def __init__(self, archived, hot):
+        self.archived = archived
+        self.hot = hot
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.archived.count() + self.hot.count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start = key.start or 0
+        stop = self.count() if key.stop is None else key.stop
+        merged = heapq.merge(
+            self.archived[:stop], self.hot[:stop], key=lambda event: event.starts_at
+        )
+        return list(islice(merged, start, stop))
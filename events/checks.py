@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+
+PER_PROCESS_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Version keys (reference data, feed stamps, suggestions) are bumped by
+    the process that made the write, so every process must share the cache"""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in PER_PROCESS_CACHES:
+        return []
+    return [Warning(
+        f'The default cache ({backend}) is private to each process.',
+        hint='Set REDIS_URL, or use a file-based cache, so category choices, '
+             'calendar feeds and suggestions are invalidated in every worker.',
+        id='events.W001',
+    )]
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_stylesheet(app_configs, **kwargs):
+    """Without DEBUG, pages link only the prebuilt Tailwind bundle"""
+    from .templatetags.assets import STYLESHEET, stylesheet_url
+
+    if settings.DEBUG or stylesheet_url() is not None:
+        return []
+    return [Error(
+        f'{STYLESHEET} has not been built and collected; pages will render unstyled.',
+        hint='Run `npm run build:css` and `python manage.py collectstatic`.',
+        id='events.E001',
+    )]
@@ -0,0 +1,159 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from . import analytics, archive, outbox, refdata, search
+from .feeds import bump_events_stamp, forget_vevents
+from .models import (
+    ArchivedEvent, Category, ChangeEntry, DailyCategoryStats, DeletionJob, Event, EventOccurrenceOverride,
+    OccurrenceRegistration,
+)
+
+
+EventRegistration = Event.participants.through
+ArchivedRegistration = ArchivedEvent.participants.through
+
+
+def batch_size():
+    return getattr(settings, 'CHUNKED_DELETE_BATCH_SIZE', 500)
+
+
+def _raw_delete(queryset):
+    # Plain DELETE ... WHERE, skipping the Collector's in-memory cascade
+    return queryset._raw_delete(queryset.db)
+
+
+def _delete_occurrence_rows(event_ids):
+    _raw_delete(OccurrenceRegistration.objects.filter(event_id__in=event_ids))
+    _raw_delete(EventOccurrenceOverride.objects.filter(event_id__in=event_ids))
+
+
+def _delete_in_batches(model, registration_model, fk_name, lookup, progress=None, on_batch=None, in_batch=None):
+    """Delete ``model`` rows matching ``lookup`` and their registration rows.
+
+    Every batch is its own short transaction, so a large cascade never
+    holds the SQLite write lock for long or loads every row into memory.
+    ``in_batch(rows)`` runs inside that transaction, before the deletes.
+    """
+    deleted = 0
+    size = batch_size()
+    while True:
+        rows = list(model.objects.filter(**lookup).order_by().values('id', 'name', 'location', 'starts_at')[:size])
+        if not rows:
+            return deleted
+        ids = [row['id'] for row in rows]
+        with transaction.atomic():
+            if in_batch:
+                in_batch(rows)
+            _raw_delete(registration_model.objects.filter(**{f'{fk_name}__in': ids}))
+            if model is Event:
+                _delete_occurrence_rows(ids)
+                outbox.record_deleted(ChangeEntry.EVENT, ids)
+            deleted += _raw_delete(model.objects.filter(id__in=ids))
+        if on_batch:
+            on_batch(rows)
+        if progress:
+            progress(deleted)
+
+
+def delete_event(event_id):
+    """Delete an event, removing its registrations in bounded batches first"""
+    analytics.event_removed(event_id)
+    size = batch_size()
+    while True:
+        registration_ids = list(EventRegistration.objects.filter(event_id=event_id).values_list('id', flat=True)[:size])
+        if not registration_ids:
+            break
+        # The event's tombstone covers its registrations, as for any delete
+        _raw_delete(EventRegistration.objects.filter(id__in=registration_ids))
+    rows = list(Event.objects.filter(id=event_id).values('id', 'name', 'location'))
+    with transaction.atomic():
+        _delete_occurrence_rows([event_id])
+        deleted = _raw_delete(Event.objects.filter(id=event_id))
+        if deleted:
+            outbox.record_deleted(ChangeEntry.EVENT, [event_id])
+    _forget_deleted_events(rows)
+    bump_events_stamp()
+    return deleted
+
+
+def _forget_deleted_events(rows):
+    # Raw deletes skip the model signals, so drop derived data here
+    forget_vevents(*[row['id'] for row in rows])
+    search.unindex_rows(rows)
+
+
+def _unroll_archived(rows):
+    # The dashboard reads archived totals from ArchiveRollup only
+    per_event = dict(
+        ArchivedRegistration.objects.filter(archivedevent_id__in=[row['id'] for row in rows])
+        .values('archivedevent_id').annotate(n=Count('id')).values_list('archivedevent_id', 'n')
+    )
+    archive.update_rollup(rows, per_event, -1)
+
+
+def delete_category(category_id, progress=None):
+    """Delete a category and every hot and archived event it owns"""
+    deleted = _delete_in_batches(
+        Event, EventRegistration, 'event_id', {'category_id': category_id}, progress,
+        on_batch=_forget_deleted_events,
+    )
+    archived = _delete_in_batches(
+        ArchivedEvent, ArchivedRegistration, 'archivedevent_id', {'category_id': category_id},
+        in_batch=_unroll_archived,
+    )
+    _raw_delete(DailyCategoryStats.objects.filter(category_id=category_id))
+    with transaction.atomic():
+        if _raw_delete(Category.objects.filter(id=category_id)):
+            outbox.record_deleted(ChangeEntry.CATEGORY, [category_id])
+    refdata.bump_categories()
+    bump_events_stamp()
+    return deleted + archived
+
+
+def category_delete_counts(category_id):
+    """Cheap indexed COUNTs of everything delete_category removes, for the
+    confirmation page"""
+    event_ids = Event.objects.filter(category_id=category_id).values('id')
+    archived_ids = ArchivedEvent.objects.filter(category_id=category_id).values('id')
+    counts = {
+        'event_count': Event.objects.filter(category_id=category_id).count(),
+        'registration_count': EventRegistration.objects.filter(event_id__in=event_ids).count(),
+        'archived_event_count': ArchivedEvent.objects.filter(category_id=category_id).count(),
+        'archived_registration_count': ArchivedRegistration.objects.filter(archivedevent_id__in=archived_ids).count(),
+        'stats_day_count': DailyCategoryStats.objects.filter(category_id=category_id).count(),
+    }
+    counts['total_event_count'] = counts['event_count'] + counts['archived_event_count']
+    counts['total_registration_count'] = counts['registration_count'] + counts['archived_registration_count']
+    return counts
+
+
+def needs_background_delete(count):
+    return count > getattr(settings, 'CHUNKED_DELETE_BACKGROUND_THRESHOLD', 5000)
+
+
+def claim_next_job():
+    """Atomically move one pending job to running, so two workers polling
+    the queue never run the same delete"""
+    pending = DeletionJob.objects.filter(status=DeletionJob.PENDING).order_by('pk').values_list('pk', flat=True)
+    for pk in pending[:10]:
+        if DeletionJob.objects.filter(pk=pk, status=DeletionJob.PENDING).update(status=DeletionJob.RUNNING):
+            return DeletionJob.objects.get(pk=pk)
+    return None
+
+
+def run_deletion_job(job):
+    """Carry out a claimed DeletionJob, recording progress as batches finish"""
+    def progress(deleted):
+        DeletionJob.objects.filter(pk=job.pk).update(deleted=deleted)
+
+    try:
+        if job.target == DeletionJob.CATEGORY:
+            deleted = delete_category(job.target_id, progress)
+        else:
+            delete_event(job.target_id)
+            deleted = 1
+    except Exception as e:
+        DeletionJob.objects.filter(pk=job.pk).update(status=DeletionJob.FAILED, error=str(e))
+        raise
+    DeletionJob.objects.filter(pk=job.pk).update(status=DeletionJob.DONE, deleted=deleted)
@@ -0,0 +1,202 @@
+import hashlib
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from . import recurrence
+from .models import Event, EventOccurrenceOverride
+
+
+FEED_CACHE_TTL = 24 * 60 * 60
+EVENTS_STAMP = 'ics:stamp:events'
+
+VEVENT_FIELDS = [
+    'id', 'name', 'description', 'starts_at', 'ends_at', 'location', 'latitude', 'longitude',
+    'category__name', 'recurrence_rule',
+]
+
+
+# Change stamps: feeds are validated against these instead of the database,
+# so a conditional GET for an unchanged feed is answered from the cache alone.
+
+def _stamp(key):
+    cache.add(key, time.time(), None)
+    return cache.get(key) or time.time()
+
+
+def participant_stamp_key(participant_id):
+    return f'ics:stamp:participant:{participant_id}'
+
+
+# Invalidation runs once the write commits: done earlier, a concurrent
+# request could re-cache the pre-write rows under the new stamp.
+
+def bump_events_stamp():
+    """Invalidate every feed; called on any event or category write"""
+    transaction.on_commit(lambda: cache.set(EVENTS_STAMP, time.time(), None))
+
+
+def bump_participant_stamp(*participant_ids):
+    def bump():
+        now = time.time()
+        cache.set_many({participant_stamp_key(pk): now for pk in participant_ids}, None)
+    transaction.on_commit(bump)
+
+
+def forget_vevents(*event_ids):
+    keys = [vevent_key(pk) for pk in event_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def feed_stamps(scope, pk=None):
+    stamps = [_stamp(EVENTS_STAMP)]
+    if scope == 'participant':
+        stamps.append(_stamp(participant_stamp_key(pk)))
+    return stamps
+
+
+def feed_etag(scope, pk=None):
+    raw = f'{scope}:{pk}:' + ':'.join(repr(s) for s in feed_stamps(scope, pk))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def feed_last_modified(scope, pk=None):
+    return datetime.fromtimestamp(max(feed_stamps(scope, pk)), tz=dt_timezone.utc)
+
+
+# iCalendar rendering (RFC 5545)
+
+def _escape(value):
+    return (
+        (value or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Fold content lines longer than 75 octets"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts, limit = [], 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Don't split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _ics_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _ics_local(name, value):
+    # Series repeat in local wall time, so they are anchored to a TZID
+    # rather than UTC to keep the same hour across DST changes
+    local = timezone.localtime(value)
+    return f'{name};TZID={timezone.get_current_timezone_name()}:{local:%Y%m%dT%H%M%S}'
+
+
+def vevent_key(event_id):
+    return f'ics:vevent:{event_id}'
+
+
+def render_vevent(row, overrides=()):
+    """VEVENT for an event row; a series gets an RRULE, EXDATEs for cancelled
+    occurrences and a RECURRENCE-ID block for each moved one"""
+    series = bool(row.get('recurrence_rule'))
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:event-{row["id"]}@django-event-manager',
+        f'DTSTAMP:{_ics_datetime(datetime.now(dt_timezone.utc))}',
+        _ics_local('DTSTART', row['starts_at']) if series else f'DTSTART:{_ics_datetime(row["starts_at"])}',
+    ]
+    if row['ends_at']:
+        if series:
+            lines.append(f'DURATION:PT{int((row["ends_at"] - row["starts_at"]).total_seconds())}S')
+        else:
+            lines.append(f'DTEND:{_ics_datetime(row["ends_at"])}')
+    if series:
+        lines.append(f'RRULE:{recurrence.ics_rule(row["recurrence_rule"])}')
+        lines += [_ics_local('EXDATE', override.original_start) for override in overrides if override.cancelled]
+    lines += [
+        f'SUMMARY:{_escape(row["name"])}',
+        f'DESCRIPTION:{_escape(row["description"])}',
+        f'LOCATION:{_escape(row["location"])}',
+    ]
+    if row.get('latitude') is not None and row.get('longitude') is not None:
+        lines.append(f'GEO:{row["latitude"]:.6f};{row["longitude"]:.6f}')
+    lines += [
+        f'CATEGORIES:{_escape(row["category__name"])}',
+        'END:VEVENT',
+    ]
+    for override in overrides:
+        if override.cancelled:
+            continue
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:event-{row["id"]}@django-event-manager',
+            f'DTSTAMP:{_ics_datetime(datetime.now(dt_timezone.utc))}',
+            _ics_local('RECURRENCE-ID', override.original_start),
+            f'DTSTART:{_ics_datetime(override.starts_at or override.original_start)}',
+            f'SUMMARY:{_escape(row["name"])}',
+            f'LOCATION:{_escape(override.location or row["location"])}',
+            'END:VEVENT',
+        ]
+    return ''.join(_fold(line) for line in lines)
+
+
+def iter_calendar(queryset, name, body_key=None):
+    """Stream a VCALENDAR for ``queryset``, reusing cached VEVENT blocks.
+
+    Only events whose block was invalidated since the last build are read
+    with ``.values()`` and re-rendered. The assembled body is cached under
+    ``body_key`` once fully streamed.
+    """
+    chunks = []
+
+    def emit(chunk):
+        chunks.append(chunk)
+        return chunk
+
+    yield emit(''.join(_fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Django Event Manager//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_escape(name)}',
+    ]))
+
+    event_ids = list(queryset.order_by('starts_at').values_list('id', flat=True))
+    for start in range(0, len(event_ids), 500):
+        batch = event_ids[start:start + 500]
+        cached = cache.get_many([vevent_key(pk) for pk in batch])
+        missing = [pk for pk in batch if vevent_key(pk) not in cached]
+        if missing:
+            rows = list(Event.objects.filter(id__in=missing).values(*VEVENT_FIELDS))
+            overrides = {}
+            series_ids = [row['id'] for row in rows if row['recurrence_rule']]
+            if series_ids:
+                for override in EventOccurrenceOverride.objects.filter(event_id__in=series_ids):
+                    overrides.setdefault(override.event_id, []).append(override)
+            rendered = {
+                vevent_key(row['id']): render_vevent(row, overrides.get(row['id'], ()))
+                for row in rows
+            }
+            cache.set_many(rendered, FEED_CACHE_TTL)
+            cached.update(rendered)
+        for pk in batch:
+            block = cached.get(vevent_key(pk))
+            if block:
+                yield emit(block)
+
+    yield emit('END:VCALENDAR\r\n')
+    if body_key:
+        cache.set(body_key, ''.join(chunks), FEED_CACHE_TTL)
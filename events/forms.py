@@ -1,10 +1,35 @@
+from datetime import datetime, timedelta
+from functools import partial
+
 from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from .models import Category, Event, Participant
+from . import recurrence, refdata
+from .models import Category, ChangeEntry, Event, Participant
+
+
+class ConstraintErrorMixin:
+    """Leave uniqueness to the database constraints named in
+    ``constraint_errors`` instead of checking with a query first. The view
+    saves and calls ``add_constraint_error`` if the write is rejected."""
+    constraint_errors = {}
+
+    def _get_validation_exclusions(self):
+        # Otherwise ModelForm validation runs its own EXISTS query per constraint
+        exclude = super()._get_validation_exclusions()
+        exclude.update(field for field, _ in self.constraint_errors.values())
+        return exclude
 
+    def add_constraint_error(self, error):
+        """Attach the form error for an IntegrityError; False if unrecognised"""
+        for constraint, (field, message) in self.constraint_errors.items():
+            if constraint in str(error):
+                self.add_error(field, message)
+                return True
+        return False
 
-class CategoryForm(forms.ModelForm):
+
+class CategoryForm(ConstraintErrorMixin, forms.ModelForm):
     """Form for Category CRUD operations with validation"""
     
     class Meta:
@@ -22,15 +47,16 @@ class CategoryForm(forms.ModelForm):
             }),
         }
 
+    constraint_errors = {
+        'unique_category_name_ci': ('name', 'A category with this name already exists.'),
+    }
+
     def clean_name(self):
         name = self.cleaned_data.get('name')
         if name:
             name = name.strip()
             if len(name) < 2:
                 raise ValidationError('Category name must be at least 2 characters long.')
-            # Check for duplicate names (case-insensitive)
-            if Category.objects.filter(name__iexact=name).exclude(pk=self.instance.pk).exists():
-                raise ValidationError('A category with this name already exists.')
         return name
 
 
@@ -39,7 +65,10 @@ class EventForm(forms.ModelForm):
     
     class Meta:
         model = Event
-        fields = ['name', 'description', 'date', 'time', 'location', 'category']
+        fields = [
+            'name', 'description', 'date', 'time', 'ends_at', 'recurrence_rule', 'location',
+            'latitude', 'longitude', 'category',
+        ]
         widgets = {
             'name': forms.TextInput(attrs={
                 'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
@@ -58,10 +87,28 @@ class EventForm(forms.ModelForm):
                 'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
                 'type': 'time'
             }),
+            'ends_at': forms.DateTimeInput(attrs={
+                'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
+                'type': 'datetime-local'
+            }, format='%Y-%m-%dT%H:%M'),
+            'recurrence_rule': forms.TextInput(attrs={
+                'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
+                'placeholder': 'e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10 (leave blank for a one-off event)'
+            }),
             'location': forms.TextInput(attrs={
                 'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
                 'placeholder': 'Enter event location'
             }),
+            'latitude': forms.NumberInput(attrs={
+                'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
+                'step': 'any',
+                'placeholder': 'e.g. 51.5074'
+            }),
+            'longitude': forms.NumberInput(attrs={
+                'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
+                'step': 'any',
+                'placeholder': 'e.g. -0.1278'
+            }),
             'category': forms.Select(attrs={
                 'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500'
             }),
@@ -69,8 +116,9 @@ class EventForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['category'].queryset = Category.objects.all().order_by('name')
-        self.fields['category'].empty_label = "Select a category"
+        # Options come from the reference-data cache; the queryset is only
+        # used to look up the submitted category
+        self.fields['category'].widget.choices = refdata.category_choices("Select a category")
 
     def clean_date(self):
         date = self.cleaned_data.get('date')
@@ -94,8 +142,33 @@ class EventForm(forms.ModelForm):
                 raise ValidationError('Location must be at least 3 characters long.')
         return location
 
+    def clean_recurrence_rule(self):
+        rule = self.cleaned_data.get('recurrence_rule', '').strip().upper().removeprefix('RRULE:')
+        if rule:
+            recurrence.parse_rule(rule)
+        return rule
 
-class ParticipantForm(forms.ModelForm):
+    def clean(self):
+        cleaned_data = super().clean()
+        date = cleaned_data.get('date')
+        time = cleaned_data.get('time')
+        ends_at = cleaned_data.get('ends_at')
+        if date and time and ends_at:
+            starts_at = timezone.make_aware(datetime.combine(date, time))
+            if ends_at <= starts_at:
+                self.add_error('ends_at', 'End time must be after the start time.')
+        latitude = cleaned_data.get('latitude')
+        longitude = cleaned_data.get('longitude')
+        if latitude is not None and not -90 <= latitude <= 90:
+            self.add_error('latitude', 'Latitude must be between -90 and 90.')
+        if longitude is not None and not -180 <= longitude <= 180:
+            self.add_error('longitude', 'Longitude must be between -180 and 180.')
+        if (latitude is None) != (longitude is None):
+            raise ValidationError('Enter both latitude and longitude, or neither.')
+        return cleaned_data
+
+
+class ParticipantForm(ConstraintErrorMixin, forms.ModelForm):
     """Form for Participant CRUD operations with validation"""
     
     class Meta:
@@ -115,10 +188,14 @@ class ParticipantForm(forms.ModelForm):
             }),
         }
 
+    constraint_errors = {
+        'unique_participant_email_ci': ('email', 'A participant with this email already exists.'),
+    }
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Only show upcoming events for registration
-        self.fields['events'].queryset = Event.objects.filter(date__gte=timezone.now().date()).order_by('date', 'time')
+        self.fields['events'].queryset = Event.objects.upcoming().order_by('starts_at')
         self.fields['events'].help_text = "Select events to register for (only upcoming events shown)"
 
     def clean_name(self):
@@ -135,13 +212,35 @@ class ParticipantForm(forms.ModelForm):
         email = self.cleaned_data.get('email')
         if email:
             email = email.lower().strip()
-            # Check for duplicate emails (excluding current instance)
-            if Participant.objects.filter(email__iexact=email).exclude(pk=self.instance.pk).exists():
-                raise ValidationError('A participant with this email already exists.')
         return email
 
 
-class EventSearchForm(forms.Form):
+class NearbyForm(forms.Form):
+    """Optional "near a point" filter shared by the event search forms"""
+    
+    near_lat = forms.FloatField(required=False, min_value=-90, max_value=90, widget=forms.HiddenInput)
+    near_lng = forms.FloatField(required=False, min_value=-180, max_value=180, widget=forms.HiddenInput)
+    radius_km = forms.FloatField(
+        required=False,
+        min_value=0.1,
+        max_value=500,
+        widget=forms.NumberInput(attrs={
+            'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
+            'step': 'any',
+            'placeholder': 'Radius (km)'
+        })
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if (cleaned_data.get('near_lat') is None) != (cleaned_data.get('near_lng') is None):
+            raise ValidationError('A location search needs both latitude and longitude.')
+        if cleaned_data.get('near_lat') is not None and not cleaned_data.get('radius_km'):
+            cleaned_data['radius_km'] = 10
+        return cleaned_data
+
+
+class EventSearchForm(NearbyForm):
     """Form for searching events by name and location"""
     
     search_query = forms.CharField(
@@ -149,14 +248,17 @@ class EventSearchForm(forms.Form):
         required=False,
         widget=forms.TextInput(attrs={
             'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
-            'placeholder': 'Search by event name or location...'
+            'placeholder': 'Search by event name or location...',
+            'list': 'search-suggestions',
+            'autocomplete': 'off'
         })
     )
     
-    category = forms.ModelChoiceField(
-        queryset=Category.objects.all(),
+    category = forms.TypedChoiceField(
+        choices=partial(refdata.category_choices, "All Categories"),
+        coerce=int,
+        empty_value=None,
         required=False,
-        empty_label="All Categories",
         widget=forms.Select(attrs={
             'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500'
         })
@@ -187,3 +289,82 @@ class EventSearchForm(forms.Form):
             raise ValidationError('Start date cannot be after end date.')
         
         return cleaned_data
+
+
+class AnalyticsFilterForm(forms.Form):
+    """Query parameters for the analytics JSON endpoint"""
+    
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    category = forms.IntegerField(required=False, min_value=1)
+    group = forms.ChoiceField(required=False, choices=[('day', 'Day'), ('week', 'Week')])
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get('start')
+        end = cleaned_data.get('end')
+        
+        if start and end and start > end:
+            raise ValidationError('Start date cannot be after end date.')
+        
+        return cleaned_data
+
+
+class OccurrenceFilterForm(NearbyForm):
+    """Query parameters for the occurrences JSON endpoint"""
+    
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    category = forms.IntegerField(required=False, min_value=1)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get('start')
+        end = cleaned_data.get('end')
+        
+        if start and end and start > end:
+            raise ValidationError('Start date cannot be after end date.')
+        
+        return cleaned_data
+
+
+class ChangeFeedForm(forms.Form):
+    """Query parameters for the change feed endpoint"""
+    
+    since = forms.IntegerField(required=False, min_value=0)
+    limit = forms.IntegerField(required=False, min_value=1, max_value=1000)
+    entity = forms.ChoiceField(required=False, choices=ChangeEntry.ENTITY_CHOICES)
+
+
+class OccurrenceRegistrationForm(forms.Form):
+    """Register an existing participant for one occurrence of a series"""
+    
+    email = forms.EmailField(widget=forms.EmailInput(attrs={
+        'class': 'w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500',
+        'placeholder': 'Participant email address'
+    }))
+    occurrence = forms.DateTimeField(widget=forms.HiddenInput)
+
+    def __init__(self, *args, event=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.event = event
+
+    def clean_email(self):
+        email = self.cleaned_data['email'].lower().strip()
+        participant = Participant.objects.filter(email__iexact=email).first()
+        if participant is None:
+            raise ValidationError('No participant with this email exists.')
+        self.participant = participant
+        return email
+
+    def clean_occurrence(self):
+        occurrence = self.cleaned_data['occurrence']
+        if occurrence < timezone.now():
+            raise ValidationError('This occurrence has already started.')
+        window_end = occurrence + timedelta(seconds=1)
+        starts = recurrence.iter_starts(self.event.starts_at, self.event.recurrence_rule, occurrence, window_end)
+        if next(starts, None) != occurrence:
+            raise ValidationError('This event has no occurrence at that time.')
+        if self.event.occurrence_overrides.filter(original_start=occurrence, cancelled=True).exists():
+            raise ValidationError('This occurrence has been cancelled.')
+        return occurrence
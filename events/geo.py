@@ -0,0 +1,102 @@
+import math
+
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+MAX_CELLS = 16
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Standard geohash of a point; a shared prefix means a shared cell"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def _cell_size(precision):
+    """(latitude, longitude) span in degrees of a cell at ``precision``"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180 / 2 ** lat_bits, 360 / 2 ** lng_bits
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(south, west, north, east) around a circle; longitudes may pass ±180"""
+    lat_delta = radius_km / KM_PER_DEGREE
+    south, north = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    widest = max(abs(south), abs(north))
+    if widest >= 89.9:
+        return south, -180.0, north, 180.0
+    lng_delta = min(radius_km / (KM_PER_DEGREE * math.cos(math.radians(widest))), 180.0)
+    return south, longitude - lng_delta, north, longitude + lng_delta
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """Geohash prefixes whose cells cover the circle's bounding box.
+
+    Uses the finest precision that needs at most MAX_CELLS cells, so the
+    index range scans stay few while pruning as much as possible.
+    """
+    south, west, north, east = bounding_box(latitude, longitude, radius_km)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lng_size = _cell_size(precision)
+        rows = math.floor((north + 90) / lat_size) - math.floor((south + 90) / lat_size) + 1
+        columns = math.floor((east + 180) / lng_size) - math.floor((west + 180) / lng_size) + 1
+        if rows * columns <= MAX_CELLS or precision == 1:
+            break
+
+    cells = set()
+    first_row = math.floor((south + 90) / lat_size)
+    first_column = math.floor((west + 180) / lng_size)
+    for row in range(rows):
+        cell_lat = min(-90 + (first_row + row + 0.5) * lat_size, 90.0)
+        for column in range(columns):
+            cell_lng = (first_column + column + 0.5) * lng_size % 360 - 180
+            cells.add(encode(cell_lat, cell_lng, precision))
+    return sorted(cells)
+
+
+def prefix_filter(cells, field='geohash'):
+    """OR of index range scans ``prefix <= field < prefix+1``"""
+    query = Q()
+    for prefix in cells:
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        query |= Q(**{f'{field}__gte': prefix, f'{field}__lt': upper})
+    return query
+
+
+def distance_expression(latitude, longitude):
+    """Haversine distance in km from a point, as a database expression"""
+    lat = math.radians(latitude)
+    half_dlat = (Radians(F('latitude')) - lat) / 2
+    half_dlng = (Radians(F('longitude')) - math.radians(longitude)) / 2
+    a = Power(Sin(half_dlat), 2) + math.cos(lat) * Cos(Radians(F('latitude'))) * Power(Sin(half_dlng), 2)
+    # Least() guards ASIN against rounding just past 1 for antipodal points
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(Least(a, 1.0)), output_field=FloatField())
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """Haversine distance between two points"""
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
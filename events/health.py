@@ -0,0 +1,78 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from .archive import archived_totals
+from .models import Category, Event, Participant
+
+
+READINESS_CACHE_KEY = 'health:readiness'
+METRICS_CACHE_KEY = 'metrics:counts'
+
+# One shared thread so a hung database can't pile up probe threads
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='readiness')
+
+
+def _probe_database():
+    """Round-trip a SELECT 1 and check for unapplied migrations"""
+    try:
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        executor = MigrationExecutor(connection)
+        pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        return latency_ms, [f'{migration.app_label}.{migration.name}' for migration, _ in pending]
+    finally:
+        # The probe thread owns its own connection; don't leak it
+        connections.close_all()
+
+
+def readiness():
+    """Deep check result, cached for HEALTH_READINESS_CACHE_TTL seconds"""
+    result = cache.get(READINESS_CACHE_KEY)
+    if result is not None:
+        return result
+
+    timeout = getattr(settings, 'HEALTH_DB_TIMEOUT', 2.0)
+    future = _executor.submit(_probe_database)
+    try:
+        latency_ms, pending = future.result(timeout=timeout)
+    except TimeoutError:
+        result = {'status': 'error', 'database': f'timed out after {timeout}s'}
+    except Exception as e:
+        result = {'status': 'error', 'database': str(e)}
+    else:
+        result = {
+            'status': 'error' if pending else 'ready',
+            'database': 'OK',
+            'db_latency_ms': round(latency_ms, 2),
+            'migrations': 'pending' if pending else 'applied',
+            'pending_migrations': pending,
+        }
+    result['checked_at'] = timezone.now().isoformat()
+
+    cache.set(READINESS_CACHE_KEY, result, getattr(settings, 'HEALTH_READINESS_CACHE_TTL', 10))
+    return result
+
+
+def cached_counts():
+    """Event/participant totals, recomputed at most every METRICS_CACHE_TTL seconds"""
+    def compute():
+        now = timezone.now()
+        return {
+            'events': Event.objects.count(),
+            'upcoming_events': Event.objects.upcoming(now).count(),
+            'archived_events': archived_totals()['events'],
+            'categories': Category.objects.count(),
+            'participants': Participant.objects.count(),
+            'computed_at': now.isoformat(),
+        }
+    return cache.get_or_set(METRICS_CACHE_KEY, compute, getattr(settings, 'METRICS_CACHE_TTL', 60))
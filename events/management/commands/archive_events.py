@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from events.archive import archive_cutoff, archive_events
+
+
+class Command(BaseCommand):
+    help = 'Move past events and their registrations into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Archive events that started more than this many days ago '
+                 '(defaults to settings.EVENT_ARCHIVE_AFTER_DAYS)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of events moved per transaction'
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] is None:
+            cutoff = archive_cutoff()
+        else:
+            cutoff = timezone.now() - timedelta(days=options['days'])
+        self.stdout.write(f'Archiving events that started before {cutoff:%Y-%m-%d %H:%M}...')
+        
+        events, registrations = archive_events(cutoff, batch_size=options['batch_size'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Archived {events} event(s) and {registrations} registration(s).')
+        )
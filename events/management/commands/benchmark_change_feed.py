@@ -0,0 +1,87 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from events import signals
+from events.models import Category, Event, Participant
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure the write overhead of recording changes in the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Writes per operation')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        self.stdout.write(f'{"operation":<22} {"outbox":>7} {"ms/write":>9} {"queries/write":>14}')
+        for operation in ('category save', 'event save', 'participant save', 'registration add'):
+            for enabled in (False, True):
+                elapsed, queries = self.measure(operation, rows, enabled)
+                self.stdout.write(
+                    f'{operation:<22} {"on" if enabled else "off":>7} '
+                    f'{elapsed * 1000 / rows:>9.3f} {queries / rows:>14.1f}'
+                )
+        self.stdout.write(self.style.SUCCESS('Benchmark data rolled back'))
+
+    def measure(self, operation, rows, enabled):
+        if not enabled:
+            self.disconnect()
+        try:
+            with transaction.atomic():
+                category = Category.objects.create(name='Outbox benchmark', description='Temporary')
+                starts_at = timezone.now() + timedelta(days=30)
+                event = Event.objects.create(
+                    name='Outbox event', description='', date=starts_at.date(), time=starts_at.time(),
+                    location='Benchmark', category=category,
+                )
+                participants = Participant.objects.bulk_create(
+                    Participant(name=f'Outbox {i}', email=f'outbox-{i}@example.com') for i in range(rows)
+                )
+                # The query log is capped, so a full log from earlier runs would hide new queries
+                reset_queries()
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    for i in range(rows):
+                        if operation == 'category save':
+                            category.description = f'Revision {i}'
+                            category.save()
+                        elif operation == 'event save':
+                            event.description = f'Revision {i}'
+                            event.save()
+                        elif operation == 'participant save':
+                            participants[i].name = f'Renamed {i}'
+                            participants[i].save()
+                        else:
+                            participants[i].events.add(event)
+                    elapsed = time.perf_counter() - started
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            if not enabled:
+                self.connect()
+        return elapsed, len(captured.captured_queries)
+
+    def receivers(self):
+        for sender in signals.OUTBOX_MODELS:
+            yield post_save, signals.outbox_saved, sender
+            yield post_delete, signals.outbox_deleted, sender
+        yield m2m_changed, signals.outbox_registrations, Participant.events.through
+
+    def disconnect(self):
+        for signal, receiver, sender in self.receivers():
+            signal.disconnect(receiver, sender=sender)
+
+    def connect(self):
+        for signal, receiver, sender in self.receivers():
+            signal.connect(receiver, sender=sender)
@@ -0,0 +1,96 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from events import geo
+from events.models import Category, Event
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare the geohash-pruned "near me" search with a full distance scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=1_000_000, help='Synthetic events to insert')
+        parser.add_argument('--queries', type=int, default=20, help='Random searches per radius')
+        parser.add_argument('--radius', type=float, action='append', help='Radius in km (repeatable)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        radii = options['radius'] or [1, 10, 50]
+        try:
+            with transaction.atomic():
+                self.populate(options['events'], rng)
+                self.stdout.write(f'{"radius":>8} {"pruned ms":>10} {"scan ms":>10} {"candidates":>11} {"matches":>8}')
+                for radius in radii:
+                    self.compare(radius, options['queries'], rng)
+                raise Rollback
+        except Rollback:
+            pass
+        self.stdout.write(self.style.SUCCESS('Benchmark data rolled back'))
+
+    def populate(self, count, rng):
+        """Bulk insert events clustered around a few hundred "cities", the
+        shape real event locations have, inside the rolled-back transaction"""
+        category = Category.objects.create(name='Geo benchmark', description='Temporary')
+        cities = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(500)]
+        starts_at = timezone.make_aware(datetime.combine(timezone.localdate() + timedelta(days=30), datetime.min.time()))
+        started = time.perf_counter()
+        batch = []
+        for i in range(count):
+            lat, lng = rng.choice(cities)
+            lat = max(-90.0, min(90.0, lat + rng.gauss(0, 0.3)))
+            lng = (lng + rng.gauss(0, 0.3) + 180) % 360 - 180
+            batch.append(Event(
+                name=f'Geo event {i}', description='', date=starts_at.date(), time=starts_at.time(),
+                starts_at=starts_at, recurrence_end=starts_at, location='Benchmark',
+                latitude=lat, longitude=lng, geohash=geo.encode(lat, lng), category=category,
+            ))
+            if len(batch) == 5000:
+                Event.objects.bulk_create(batch)
+                batch = []
+        Event.objects.bulk_create(batch)
+        # Fresh planner statistics, as a long-lived database would have
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Event._meta.db_table}')
+        self.cities = cities
+        self.stdout.write(f'Inserted {count} events in {time.perf_counter() - started:.1f}s')
+
+    def compare(self, radius, queries, rng):
+        pruned_time = scan_time = 0.0
+        candidates = matches = 0
+        for _ in range(queries):
+            lat, lng = rng.choice(self.cities)
+            lat, lng = lat + rng.gauss(0, 0.2), lng + rng.gauss(0, 0.2)
+
+            started = time.perf_counter()
+            near = list(Event.objects.near(lat, lng, radius).values_list('id', flat=True))
+            pruned_time += time.perf_counter() - started
+            candidates += Event.objects.filter(
+                geo.prefix_filter(geo.covering_cells(lat, lng, radius))
+            ).count()
+
+            started = time.perf_counter()
+            scan = list(
+                Event.objects.exclude(latitude=None)
+                .annotate(distance_km=geo.distance_expression(lat, lng))
+                .filter(distance_km__lte=radius).values_list('id', flat=True)
+            )
+            scan_time += time.perf_counter() - started
+
+            if sorted(near) != sorted(scan):
+                raise RuntimeError(f'Pruned search disagrees with the full scan at ({lat}, {lng}, {radius} km)')
+            matches += len(near)
+
+        self.stdout.write(
+            f'{radius:>8g} {pruned_time * 1000 / queries:>10.1f} {scan_time * 1000 / queries:>10.1f} '
+            f'{candidates / queries:>11.0f} {matches / queries:>8.0f}'
+        )
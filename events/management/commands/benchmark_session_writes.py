@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+
+PROFILES = {
+    'db': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.session.SessionStorage',
+    },
+    'cookie': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.signed_cookies',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+    'cache': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cache',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+}
+
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Count DB queries per category CRUD round-trip for each session/message profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=20, help='CRUD round-trips per profile')
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        self.stdout.write(f'{"profile":<8} {"queries":>8} {"writes":>8} {"session":>8}  (per round-trip)')
+
+        for name, profile in PROFILES.items():
+            queries = self.run_profile(profile, rounds)
+            writes = [q for q in queries if q.lstrip().upper().startswith(WRITE_PREFIXES)]
+            session = [q for q in queries if 'django_session' in q]
+            self.stdout.write(
+                f'{name:<8} {len(queries) / rounds:>8.1f} {len(writes) / rounds:>8.1f} '
+                f'{len(session) / rounds:>8.1f}'
+            )
+
+    def run_profile(self, profile, rounds):
+        """Create, update and delete a category, following each redirect so
+        the flash message is rendered, and roll everything back afterwards"""
+        client = Client()
+        captured = []
+        try:
+            with override_settings(**profile), transaction.atomic():
+                with CaptureQueriesContext(connection) as ctx:
+                    for i in range(rounds):
+                        name = f'Benchmark category {i}'
+                        response = self.post(client, reverse('category_create'), {'name': name, 'description': 'x'})
+                        pk = resolve(response.redirect_chain[-1][0]).kwargs['pk']
+                        self.post(client, reverse('category_update', args=[pk]), {'name': name, 'description': 'y'})
+                        self.post(client, reverse('category_delete', args=[pk]), {})
+                captured = [q['sql'] for q in ctx.captured_queries]
+                raise Rollback
+        except Rollback:
+            pass
+        return captured
+
+    def post(self, client, url, data):
+        response = client.post(url, data, follow=True, HTTP_HOST='localhost')
+        # response.context is only recorded under setup_test_environment(),
+        # so look for the rendered message in the page itself
+        if b'role="alert"' not in response.content:
+            raise RuntimeError(f'No flash message rendered after POST {url}')
+        return response
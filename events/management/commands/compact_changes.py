@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from events.outbox import compact
+
+
+class Command(BaseCommand):
+    help = 'Delete change feed entries superseded by a newer change to the same object'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Only compact entries older than this many days '
+                 '(defaults to settings.CHANGE_FEED_COMPACT_AFTER_DAYS)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of entries deleted per statement'
+        )
+
+    def handle(self, *args, **options):
+        older_than = None
+        if options['days'] is not None:
+            older_than = timezone.now() - timedelta(days=options['days'])
+        deleted = compact(older_than, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Removed {deleted} superseded change(s).'))
@@ -21,9 +21,11 @@ class Command(BaseCommand):
         
         categories = []
         for cat_data in categories_data:
+            # Case-insensitive lookups match the unique constraints, so a
+            # concurrent or differently cased insert is picked up, not duplicated
             category, created = Category.objects.get_or_create(
-                name=cat_data['name'],
-                defaults={'description': cat_data['description']}
+                name__iexact=cat_data['name'],
+                defaults=cat_data
             )
             categories.append(category)
             if created:
@@ -67,8 +69,8 @@ class Command(BaseCommand):
         
         for part_data in participants_data:
             participant, created = Participant.objects.get_or_create(
-                email=part_data['email'],
-                defaults={'name': part_data['name']}
+                email__iexact=part_data['email'],
+                defaults=part_data
             )
             if created:
                 # Add participant to some events
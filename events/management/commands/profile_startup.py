@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from events import warmup
+from events.models import Event
+
+
+# What a worker imports before and on its first request
+IMPORT_SCRIPT = (
+    'from django.core.wsgi import get_wsgi_application; get_wsgi_application(); '
+    'from django.urls import get_resolver; get_resolver().url_patterns'
+)
+PROJECT_PACKAGES = ('events', 'event_management')
+
+
+class Command(BaseCommand):
+    help = 'Report import time and first-request cost per module, as a cold worker pays them'
+    # System checks resolve the URLconf, which would hide its first-request cost
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help='Packages listed by import time')
+
+    def handle(self, *args, **options):
+        self.report_imports(options['top'])
+        self.report_first_request()
+
+    def report_imports(self, top):
+        """Run the app's imports in a fresh interpreter under -X importtime"""
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', IMPORT_SCRIPT],
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ['DJANGO_SETTINGS_MODULE']},
+            capture_output=True, text=True, check=True,
+        )
+        packages = defaultdict(float)
+        project = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            self_us, cumulative_us, module = line[len('import time:'):].split('|')
+            if not self_us.strip().isdigit():
+                continue
+            module = module.strip()
+            packages[module.split('.')[0]] += int(self_us) / 1000
+            if module.split('.')[0] in PROJECT_PACKAGES:
+                project.append((module, int(self_us) / 1000, int(cumulative_us) / 1000))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Import time (total {sum(packages.values()):.1f} ms)'))
+        self.stdout.write(f'{"package":<30} {"self ms":>9}')
+        for package, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            self.stdout.write(f'{package:<30} {ms:>9.1f}')
+        self.stdout.write(f'\n{"project module":<30} {"self ms":>9} {"cumulative ms":>14}')
+        for module, self_ms, cumulative_ms in sorted(project, key=lambda item: -item[2]):
+            self.stdout.write(f'{module:<30} {self_ms:>9.1f} {cumulative_ms:>14.1f}')
+
+    def report_first_request(self):
+        """Time each warm-up stage cold in this process, then each page's
+        first request against a repeat of it"""
+        client = Client(raise_request_exception=False)
+        stages = [
+            ('middleware', client.handler.load_middleware),
+            ('database connection', warmup.connect_databases),
+            *warmup.STAGES,
+        ]
+        self.stdout.write(self.style.MIGRATE_HEADING('\nFirst-request cost (done by the warm-up hook)'))
+        self.stdout.write(f'{"stage":<30} {"ms":>9}')
+        for name, stage in stages:
+            started = time.perf_counter()
+            stage()
+            self.stdout.write(f'{name:<30} {(time.perf_counter() - started) * 1000:>9.1f}')
+
+        paths = ['/', '/events/', '/categories/', '/participants/', '/api/changes/', '/health/ready/']
+        event = Event.objects.order_by('pk').first()
+        if event:
+            paths.insert(2, event.get_absolute_url())
+        self.stdout.write(self.style.MIGRATE_HEADING('\nRemaining cost after warm-up'))
+        self.stdout.write(f'{"path":<30} {"status":>6} {"first ms":>9} {"repeat ms":>10}')
+        for path in paths:
+            timings = []
+            for _ in range(2):
+                started = time.perf_counter()
+                response = client.get(path)
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(f'{path:<30} {response.status_code:>6} {timings[0]:>9.1f} {timings[1]:>10.1f}')
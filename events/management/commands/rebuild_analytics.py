@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from events import analytics
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily analytics rollup from the event and archive tables'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding analytics rollup...')
+        rows = analytics.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} day/category row(s).'))
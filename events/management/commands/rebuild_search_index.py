@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from events import search
+from events.models import SuggestionTerm
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the type-ahead suggestion index from event names and locations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--if-empty', action='store_true',
+            help='Only build the index if it has no terms yet (e.g. right after migrating)'
+        )
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and SuggestionTerm.objects.exists():
+            self.stdout.write('Search suggestion index already built.')
+            return
+        
+        self.stdout.write('Rebuilding search suggestion index...')
+        terms = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {terms} term(s).'))
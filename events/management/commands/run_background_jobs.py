@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from events import deletion, notifications, outbox
+from events.archive import archive_events
+
+
+class Command(BaseCommand):
+    help = ('Process queued notification and deletion jobs, and archive old events and '
+            'compact the change feed once a day, in one loop')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll', type=int, default=10,
+            help='Check the job queues every N seconds'
+        )
+        parser.add_argument(
+            '--daily-hour', type=int, default=3,
+            help='Local hour from which the daily archive and compaction run'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the queues (and run the daily tasks if due) once and exit'
+        )
+
+    def handle(self, *args, **options):
+        last_daily = None
+        while True:
+            self.drain('notification', notifications.claim_next_job, notifications.run_job)
+            self.drain('deletion', deletion.claim_next_job, deletion.run_deletion_job)
+
+            now = timezone.localtime()
+            if last_daily != now.date() and now.hour >= options['daily_hour']:
+                self.run_daily()
+                last_daily = now.date()
+
+            if options['once']:
+                break
+            time.sleep(options['poll'])
+
+    def drain(self, kind, claim, run):
+        job = claim()
+        while job:
+            try:
+                run(job)
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f'{kind.capitalize()} job {job.pk} failed: {e}'))
+            else:
+                self.stdout.write(f'Finished {kind} job {job.pk}')
+            job = claim()
+
+    def run_daily(self):
+        try:
+            events, registrations = archive_events()
+            compacted = outbox.compact()
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'Daily maintenance failed: {e}'))
+            return
+        self.stdout.write(
+            f'Archived {events} event(s) and {registrations} registration(s); '
+            f'removed {compacted} superseded change(s)'
+        )
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from events.notifications import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = 'Send queued event change and cancellation emails to registered participants'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll', type=int, default=0,
+            help='Keep running and check for due jobs every N seconds'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_job()
+            while job:
+                self.stdout.write(f'Running {job}...')
+                try:
+                    sent = run_job(job)
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f'Job {job.pk} failed: {e}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'Sent {sent} email(s) for job {job.pk}'))
+                job = claim_next_job()
+            
+            if not options['poll']:
+                break
+            time.sleep(options['poll'])
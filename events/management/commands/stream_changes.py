@@ -0,0 +1,33 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from events.outbox import changes_since, serialize
+
+
+class Command(BaseCommand):
+    help = 'Print change feed entries after a cursor as JSON lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=int, default=0, help='Cursor to resume from')
+        parser.add_argument('--limit', type=int, default=500, help='Entries read per query')
+        parser.add_argument(
+            '--poll', type=int, default=0,
+            help='Keep running and check for new entries every N seconds'
+        )
+
+    def handle(self, *args, **options):
+        cursor = options['since']
+        while True:
+            entries = changes_since(cursor, options['limit'])
+            for entry in entries:
+                self.stdout.write(json.dumps(serialize(entry)))
+            if entries:
+                cursor = entries[-1].pk
+                self.stdout.flush()
+            if len(entries) == options['limit']:
+                continue
+            if not options['poll']:
+                break
+            time.sleep(options['poll'])
+        self.stderr.write(f'Next cursor: {cursor}')
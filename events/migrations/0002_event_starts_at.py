@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_starts_at(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    tz = timezone.get_default_timezone()
+    batch = []
+    for event in Event.objects.only('id', 'date', 'time').iterator(chunk_size=1000):
+        event.starts_at = timezone.make_aware(datetime.combine(event.date, event.time), tz)
+        batch.append(event)
+        if len(batch) >= 1000:
+            Event.objects.bulk_update(batch, ['starts_at'])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ['starts_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='starts_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_starts_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='event',
+            name='starts_at',
+            field=models.DateTimeField(db_index=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterModelOptions(
+            name='event',
+            options={'ordering': ['starts_at']},
+        ),
+    ]
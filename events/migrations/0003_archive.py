@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_starts_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('registration_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('starts_at', models.DateTimeField(db_index=True)),
+                ('ends_at', models.DateTimeField(blank=True, null=True)),
+                ('location', models.CharField(max_length=200)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='events.category')),
+                ('participants', models.ManyToManyField(blank=True, related_name='archived_events', to='events.participant')),
+            ],
+            options={
+                'ordering': ['starts_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_deletionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCategoryStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('events_scheduled', models.IntegerField(default=0)),
+                ('registrations_added', models.IntegerField(default=0)),
+                ('registrations_removed', models.IntegerField(default=0)),
+                ('active_participants', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='events.category')),
+            ],
+            options={
+                'verbose_name_plural': 'Daily category stats',
+                'ordering': ['day', 'category'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailycategorystats',
+            constraint=models.UniqueConstraint(fields=('day', 'category'), name='unique_daily_category_stats'),
+        ),
+    ]
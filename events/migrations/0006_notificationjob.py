@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_daily_category_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.BigIntegerField(db_index=True)),
+                ('kind', models.CharField(choices=[('changed', 'Changed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('run_after', models.DateTimeField(db_index=True)),
+                ('sent', models.PositiveIntegerField(default=0)),
+                ('cursor', models.BigIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['run_after'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='notificationjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('event_id', 'kind'), name='unique_pending_notification'),
+        ),
+    ]
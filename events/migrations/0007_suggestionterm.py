@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_notificationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SuggestionTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(db_index=True, max_length=100)),
+                ('text', models.CharField(max_length=200)),
+                ('kind', models.CharField(choices=[('name', 'Name'), ('location', 'Location')], max_length=20)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['token', 'text'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='suggestionterm',
+            constraint=models.UniqueConstraint(fields=('token', 'text', 'kind'), name='unique_suggestion_term'),
+        ),
+    ]
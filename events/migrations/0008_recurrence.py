@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_recurrence_end(apps, schema_editor):
+    # Existing events are all single occurrences
+    Event = apps.get_model('events', 'Event')
+    Event.objects.update(recurrence_end=models.F('starts_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_suggestionterm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_end',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_rule',
+            field=models.CharField(blank=True, help_text='Optional RRULE, e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10', max_length=200),
+        ),
+        migrations.RunPython(backfill_recurrence_end, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='OccurrenceRegistration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurrence_start', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrence_registrations', to='events.event')),
+                ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrence_registrations', to='events.participant')),
+            ],
+            options={
+                'ordering': ['occurrence_start'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EventOccurrenceOverride',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_start', models.DateTimeField()),
+                ('cancelled', models.BooleanField(default=False)),
+                ('starts_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('location', models.CharField(blank=True, max_length=200)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrence_overrides', to='events.event')),
+            ],
+            options={
+                'ordering': ['original_start'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='occurrenceregistration',
+            constraint=models.UniqueConstraint(fields=('event', 'occurrence_start', 'participant'), name='unique_occurrence_registration'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventoccurrenceoverride',
+            constraint=models.UniqueConstraint(fields=('event', 'original_start'), name='unique_occurrence_override'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_recurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedevent',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='archivedevent',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedevent',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
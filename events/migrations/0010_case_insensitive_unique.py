@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:58
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+def find_duplicates(apps, schema_editor):
+    # Fail before adding the constraints, naming the rows to merge or rename,
+    # rather than letting CREATE UNIQUE INDEX fail without saying which
+    problems = []
+    for model_name, field in (('Category', 'name'), ('Participant', 'email')):
+        model = apps.get_model('events', model_name)
+        duplicates = (
+            model.objects.annotate(key=django.db.models.functions.text.Lower(field))
+            .values('key').annotate(n=models.Count('id')).filter(n__gt=1).order_by('key')
+        )
+        for row in duplicates:
+            ids = list(
+                model.objects.filter(**{f'{field}__iexact': row['key']}).order_by('id').values_list('id', flat=True)
+            )
+            problems.append(f'{model_name} {field} "{row["key"]}": ids {ids}')
+    if problems:
+        raise RuntimeError(
+            'Resolve case-insensitive duplicates before migrating:\n' + '\n'.join(problems)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_geohash'),
+    ]
+
+    operations = [
+        migrations.RunPython(find_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='participant',
+            name='email',
+            field=models.EmailField(db_index=True, max_length=254),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='unique_category_name_ci', violation_error_message='A category with this name already exists.'),
+        ),
+        migrations.AddConstraint(
+            model_name='participant',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='unique_participant_email_ci', violation_error_message='A participant with this email already exists.'),
+        ),
+    ]
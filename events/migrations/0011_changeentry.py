@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:01
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_case_insensitive_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('event', 'Event'), ('category', 'Category'), ('participant', 'Participant'), ('registration', 'Registration')], max_length=20)),
+                ('key', models.CharField(max_length=50)),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')], max_length=20)),
+                ('payload', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Change entries',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['entity', 'key', 'id'], name='change_entry_key_idx')],
+            },
+        ),
+    ]
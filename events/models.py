@@ -1,9 +1,32 @@
-from django.db import models
+from datetime import datetime, timedelta
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import BooleanField, Case, Value, When
+from django.db.models.functions import Lower
 from django.urls import reverse
 from django.utils import timezone
 
+from . import geo, recurrence
+
+
+def day_bounds(day):
+    """Return the aware [start, end) datetimes covering a local calendar day"""
+    start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+    return start, start + timedelta(days=1)
+
+
+class AtomicSaveMixin:
+    """Run save() and its post_save receivers in one transaction, so the
+    change outbox entry commits or rolls back with the row it describes"""
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+
 
-class Category(models.Model):
+class Category(AtomicSaveMixin, models.Model):
     """Category model as specified in Section 1.1"""
     name = models.CharField(max_length=100)
     description = models.TextField()
@@ -14,49 +37,186 @@ class Category(models.Model):
     class Meta:
         ordering = ['name']
         verbose_name_plural = 'Categories'
+        constraints = [
+            models.UniqueConstraint(
+                Lower('name'),
+                name='unique_category_name_ci',
+                violation_error_message='A category with this name already exists.',
+            ),
+        ]
 
     def get_absolute_url(self):
         return reverse('category_detail', kwargs={'pk': self.pk})
 
 
-class Event(models.Model):
+class EventQuerySet(models.QuerySet):
+    """Range filters over the indexed ``starts_at`` column"""
+
+    def upcoming(self, now=None):
+        return self.filter(starts_at__gte=now or timezone.now())
+
+    def past(self, now=None):
+        return self.filter(starts_at__lt=now or timezone.now())
+
+    def on_day(self, day):
+        start, end = day_bounds(day)
+        return self.filter(starts_at__gte=start, starts_at__lt=end)
+
+    def in_date_range(self, date_from=None, date_to=None):
+        """Filter by inclusive local calendar dates"""
+        queryset = self
+        if date_from:
+            queryset = queryset.filter(starts_at__gte=day_bounds(date_from)[0])
+        if date_to:
+            queryset = queryset.filter(starts_at__lt=day_bounds(date_to)[1])
+        return queryset
+
+    def near(self, latitude, longitude, radius_km):
+        """Events within ``radius_km`` of a point, annotated with ``distance_km``.
+
+        Candidates are pruned with index range scans on ``geohash`` cell
+        prefixes before the exact haversine distance is computed.
+        """
+        cells = geo.covering_cells(latitude, longitude, radius_km)
+        # As a subquery the cell ranges drive the plan; inlined next to
+        # ORDER BY starts_at, SQLite prefers walking the starts_at index
+        candidates = self.model.objects.order_by().filter(geo.prefix_filter(cells)).values('pk')
+        return (
+            self.filter(pk__in=candidates)
+            .annotate(distance_km=geo.distance_expression(latitude, longitude))
+            .filter(distance_km__lte=radius_km)
+        )
+
+    def with_status(self, now=None):
+        """Annotate upcoming/today flags in SQL against a single ``now``"""
+        now = now or timezone.now()
+        start, end = day_bounds(timezone.localdate(now))
+        return self.annotate(
+            upcoming_flag=Case(
+                When(starts_at__gte=now, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            today_flag=Case(
+                When(starts_at__gte=start, starts_at__lt=end, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+
+
+class Event(AtomicSaveMixin, models.Model):
     """Event model as specified in Section 1.2"""
     name = models.CharField(max_length=200)
     description = models.TextField()
     date = models.DateField()
     time = models.TimeField()
+    starts_at = models.DateTimeField(db_index=True, editable=False)
+    ends_at = models.DateTimeField(null=True, blank=True)
     location = models.CharField(max_length=200)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Geohash of latitude/longitude; nearby events share a prefix, so
+    # "near me" searches are index range scans on any database
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    recurrence_rule = models.CharField(
+        max_length=200, blank=True,
+        help_text='Optional RRULE, e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10',
+    )
+    # Start of the last occurrence (NULL for a series without an end), so
+    # window queries are a range filter instead of expanding every rule
+    recurrence_end = models.DateTimeField(null=True, blank=True, db_index=True, editable=False)
+
+    objects = EventQuerySet.as_manager()
+
+    is_archived = False
+    is_occurrence = False
 
     def __str__(self):
         return self.name
 
     class Meta:
-        ordering = ['date', 'time']
+        ordering = ['starts_at']
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember where the event was counted in the analytics rollup...
+        instance._loaded_starts_at = instance.__dict__.get('starts_at')
+        instance._loaded_category_id = instance.__dict__.get('category_id')
+        # ...and which texts it contributed to the suggestion index
+        instance._loaded_name = instance.__dict__.get('name')
+        instance._loaded_location = instance.__dict__.get('location')
+        return instance
+
+    def clean(self):
+        super().clean()
+        if self.recurrence_rule:
+            try:
+                recurrence.parse_rule(self.recurrence_rule)
+            except ValidationError as e:
+                raise ValidationError({'recurrence_rule': e.messages})
+
+    def save(self, *args, **kwargs):
+        # Keep the indexed column in step with the date/time inputs
+        self.starts_at = timezone.make_aware(datetime.combine(self.date, self.time))
+        if self.recurrence_rule:
+            self.recurrence_end = recurrence.last_start(self.starts_at, self.recurrence_rule)
+        else:
+            self.recurrence_end = self.starts_at
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geo.encode(self.latitude, self.longitude)
+        else:
+            self.geohash = ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'date', 'time', 'recurrence_rule'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'starts_at', 'recurrence_end'}
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'geohash'}
+        super().save(*args, **kwargs)
 
     def get_absolute_url(self):
         return reverse('event_detail', kwargs={'pk': self.pk})
 
+    @property
+    def is_recurring(self):
+        return bool(self.recurrence_rule)
+
+    def occurrences(self, start, end):
+        """Occurrences of this series starting in [start, end)"""
+        return recurrence.expand([self], start, end)
+
+    def _status_now(self):
+        # Instances not loaded through with_status() resolve "now" once
+        if not hasattr(self, '_now'):
+            self._now = timezone.now()
+        return self._now
+
     @property
     def is_upcoming(self):
-        """Check if event is in the future"""
-        return self.date >= timezone.now().date()
+        """Check if event starts in the future"""
+        if hasattr(self, 'upcoming_flag'):
+            return self.upcoming_flag
+        return self.starts_at >= self._status_now()
 
     @property
     def is_past(self):
-        """Check if event is in the past"""
-        return self.date < timezone.now().date()
+        """Check if event has already started"""
+        return not self.is_upcoming
 
     @property
     def is_today(self):
-        """Check if event is today"""
-        return self.date == timezone.now().date()
+        """Check if event starts today"""
+        if hasattr(self, 'today_flag'):
+            return self.today_flag
+        return timezone.localdate(self.starts_at) == timezone.localdate(self._status_now())
 
 
-class Participant(models.Model):
+class Participant(AtomicSaveMixin, models.Model):
     """Participant model as specified in Section 1.3"""
     name = models.CharField(max_length=100)
-    email = models.EmailField(unique=True)
+    email = models.EmailField(db_index=True)
     events = models.ManyToManyField(Event, related_name='participants', blank=True)
 
     def __str__(self):
@@ -64,6 +224,13 @@ class Participant(models.Model):
 
     class Meta:
         ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(
+                Lower('email'),
+                name='unique_participant_email_ci',
+                violation_error_message='A participant with this email already exists.',
+            ),
+        ]
 
     def get_absolute_url(self):
         return reverse('participant_detail', kwargs={'pk': self.pk})
@@ -72,3 +239,251 @@ class Participant(models.Model):
     def event_count(self):
         """Get the number of events this participant is registered for"""
         return self.events.count()
+
+
+class ArchivedEvent(models.Model):
+    """Past event moved out of the hot Event table by ``archive_events``"""
+    original_id = models.BigIntegerField(unique=True)
+    name = models.CharField(max_length=200)
+    description = models.TextField()
+    date = models.DateField()
+    time = models.TimeField()
+    starts_at = models.DateTimeField(db_index=True)
+    ends_at = models.DateTimeField(null=True, blank=True)
+    location = models.CharField(max_length=200)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    participants = models.ManyToManyField(Participant, related_name='archived_events', blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    objects = EventQuerySet.as_manager()
+
+    is_archived = True
+    is_upcoming = False
+    is_past = True
+    is_today = False
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['starts_at']
+
+
+class ArchiveRollup(models.Model):
+    """Per-day totals of archived events, so counts never touch the archive"""
+    day = models.DateField(unique=True)
+    event_count = models.PositiveIntegerField(default=0)
+    registration_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.day}: {self.event_count} events'
+
+    class Meta:
+        ordering = ['day']
+
+
+class DeletionJob(models.Model):
+    """Large cascade delete handed off to ``run_deletion_jobs``"""
+    CATEGORY = 'category'
+    EVENT = 'event'
+    TARGET_CHOICES = [(CATEGORY, 'Category'), (EVENT, 'Event')]
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    target_id = models.BigIntegerField()
+    label = models.CharField(max_length=200)
+    total = models.PositiveIntegerField(default=0)
+    deleted = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Delete {self.target} "{self.label}" ({self.status})'
+
+    class Meta:
+        ordering = ['created_at']
+
+    @property
+    def progress(self):
+        """Percentage of dependent rows removed so far"""
+        if self.status == self.DONE:
+            return 100
+        if not self.total:
+            return 0
+        return min(100, round(self.deleted * 100 / self.total))
+
+
+class DailyCategoryStats(models.Model):
+    """Incrementally maintained analytics rollup, one row per day and category.
+
+    ``events_scheduled`` and ``active_participants`` are keyed by the day
+    the events start (active registrations held for them), while
+    ``registrations_added``/``registrations_removed`` are keyed by the day
+    the registration changed.
+    """
+    day = models.DateField()
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='daily_stats')
+    events_scheduled = models.IntegerField(default=0)
+    registrations_added = models.IntegerField(default=0)
+    registrations_removed = models.IntegerField(default=0)
+    active_participants = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.day} / {self.category_id}'
+
+    class Meta:
+        ordering = ['day', 'category']
+        verbose_name_plural = 'Daily category stats'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category'], name='unique_daily_category_stats'),
+        ]
+
+
+class NotificationJob(models.Model):
+    """Queued participant notification for an event change or cancellation.
+
+    At most one pending job exists per event and kind, so repeated edits
+    before the worker picks it up collapse into a single notification.
+    """
+    CHANGED = 'changed'
+    CANCELLED = 'cancelled'
+    KIND_CHOICES = [(CHANGED, 'Changed'), (CANCELLED, 'Cancelled')]
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    event_id = models.BigIntegerField(db_index=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    run_after = models.DateTimeField(db_index=True)
+    sent = models.PositiveIntegerField(default=0)
+    cursor = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Notify {self.kind} for event {self.event_id} ({self.status})'
+
+    class Meta:
+        ordering = ['run_after']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event_id', 'kind'],
+                condition=models.Q(status='pending'),
+                name='unique_pending_notification',
+            ),
+        ]
+
+
+class SuggestionTerm(models.Model):
+    """Prefix index for search type-ahead.
+
+    One row per normalized token of an event name or location, pointing at
+    the original text. ``token`` is matched with an index range scan and
+    ``event_count`` drops the row once no event uses the text any more.
+    """
+    NAME = 'name'
+    LOCATION = 'location'
+    KIND_CHOICES = [(NAME, 'Name'), (LOCATION, 'Location')]
+
+    token = models.CharField(max_length=100, db_index=True)
+    text = models.CharField(max_length=200)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    event_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.token} -> {self.text}'
+
+    class Meta:
+        ordering = ['token', 'text']
+        constraints = [
+            models.UniqueConstraint(fields=['token', 'text', 'kind'], name='unique_suggestion_term'),
+        ]
+
+
+class EventOccurrenceOverride(models.Model):
+    """Exception to one occurrence of a recurring event: cancelled or moved"""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='occurrence_overrides')
+    original_start = models.DateTimeField()
+    cancelled = models.BooleanField(default=False)
+    starts_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    location = models.CharField(max_length=200, blank=True)
+
+    def __str__(self):
+        return f'{self.event_id} @ {self.original_start}'
+
+    class Meta:
+        ordering = ['original_start']
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'original_start'], name='unique_occurrence_override'),
+        ]
+
+
+class OccurrenceRegistration(models.Model):
+    """Participant registered for a single occurrence of a recurring event"""
+    participant = models.ForeignKey(Participant, on_delete=models.CASCADE, related_name='occurrence_registrations')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='occurrence_registrations')
+    occurrence_start = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.participant_id} -> {self.event_id} @ {self.occurrence_start}'
+
+    class Meta:
+        ordering = ['occurrence_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'occurrence_start', 'participant'], name='unique_occurrence_registration'
+            ),
+        ]
+
+
+class ChangeEntry(models.Model):
+    """Append-only outbox of changes to events, categories, participants and
+    registrations, read by downstream consumers through ``/api/changes/``.
+
+    ``id`` is the consumer's cursor. ``key`` identifies the changed object
+    (``"<id>"``, or ``"<participant_id>:<event_id>"`` for a registration);
+    compaction keeps only the newest entry per entity and key.
+    """
+    EVENT = 'event'
+    CATEGORY = 'category'
+    PARTICIPANT = 'participant'
+    REGISTRATION = 'registration'
+    ENTITY_CHOICES = [
+        (EVENT, 'Event'), (CATEGORY, 'Category'), (PARTICIPANT, 'Participant'), (REGISTRATION, 'Registration'),
+    ]
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ACTION_CHOICES = [(CREATE, 'Create'), (UPDATE, 'Update'), (DELETE, 'Delete')]
+
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    key = models.CharField(max_length=50)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'#{self.pk} {self.action} {self.entity} {self.key}'
+
+    class Meta:
+        ordering = ['id']
+        verbose_name_plural = 'Change entries'
+        indexes = [
+            models.Index(fields=['entity', 'key', 'id'], name='change_entry_key_idx'),
+        ]
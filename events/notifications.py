@@ -0,0 +1,133 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Event, NotificationJob, Participant
+
+
+NOTIFY_FIELDS = {'date', 'time', 'location'}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue_change(event):
+    """Queue a "details changed" notice: a single INSERT, ignored if a
+    pending job for this event already exists (repeated edits dedupe)"""
+    NotificationJob.objects.bulk_create([
+        NotificationJob(
+            event_id=event.pk,
+            kind=NotificationJob.CHANGED,
+            run_after=timezone.now() + timedelta(seconds=_setting('NOTIFICATION_DEBOUNCE_SECONDS', 60)),
+        )
+    ], ignore_conflicts=True)
+
+
+def enqueue_cancellation(event, participant_ids):
+    """Queue a cancellation notice in a single INSERT, with the registrants
+    and event details the worker needs once the event is gone"""
+    if not participant_ids:
+        return
+    NotificationJob.objects.bulk_create([
+        NotificationJob(
+            event_id=event.pk,
+            kind=NotificationJob.CANCELLED,
+            run_after=timezone.now(),
+            payload={
+                'name': event.name,
+                'starts_at': event.starts_at.isoformat(),
+                'location': event.location,
+                'participant_ids': list(participant_ids),
+            },
+        )
+    ], ignore_conflicts=True)
+
+
+def claim_next_job():
+    """Atomically move one due job from pending to running"""
+    due = NotificationJob.objects.filter(
+        status=NotificationJob.PENDING, run_after__lte=timezone.now()
+    ).values_list('pk', flat=True)
+    for pk in due[:10]:
+        if NotificationJob.objects.filter(pk=pk, status=NotificationJob.PENDING).update(
+            status=NotificationJob.RUNNING
+        ):
+            return NotificationJob.objects.get(pk=pk)
+    return None
+
+
+def _recipient_batches(job, batch_size):
+    """Yield participants after ``job.cursor`` in id order, a batch at a time"""
+    if job.kind == NotificationJob.CHANGED:
+        participants = Participant.objects.filter(events__id=job.event_id)
+    else:
+        participants = Participant.objects.filter(id__in=job.payload.get('participant_ids', []))
+    cursor = job.cursor
+    while True:
+        batch = list(
+            participants.filter(id__gt=cursor).order_by('id').only('id', 'name', 'email')[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        cursor = batch[-1].id
+
+
+def _event_context(job):
+    if job.kind == NotificationJob.CHANGED:
+        return Event.objects.filter(pk=job.event_id).first()
+    return dict(job.payload, starts_at=parse_datetime(job.payload['starts_at']))
+
+
+def run_job(job, sleep=time.sleep):
+    """Send a job's emails in batches, no faster than NOTIFICATION_RATE_LIMIT
+    messages per second. Progress is saved after every batch, so a failed
+    job set back to pending resumes after the last participant notified."""
+    event = _event_context(job)
+    if event is None:
+        # Event deleted before the change notice went out; the
+        # cancellation job covers it
+        NotificationJob.objects.filter(pk=job.pk).update(status=NotificationJob.DONE)
+        return 0
+
+    if job.kind == NotificationJob.CHANGED:
+        subject = f'Event updated: {event.name}'
+        template = 'events/email/event_changed.txt'
+    else:
+        subject = f'Event cancelled: {event["name"]}'
+        template = 'events/email/event_cancelled.txt'
+
+    batch_size = _setting('NOTIFICATION_BATCH_SIZE', 100)
+    rate = _setting('NOTIFICATION_RATE_LIMIT', 10)
+    connection = get_connection()
+    sent = job.sent
+    try:
+        for batch in _recipient_batches(job, batch_size):
+            started = time.monotonic()
+            messages = [
+                EmailMessage(
+                    subject,
+                    render_to_string(template, {'event': event, 'participant': participant}),
+                    to=[participant.email],
+                )
+                for participant in batch
+            ]
+            connection.send_messages(messages)
+            sent += len(messages)
+            NotificationJob.objects.filter(pk=job.pk).update(sent=sent, cursor=batch[-1].id)
+
+            if rate:
+                remaining = len(messages) / rate - (time.monotonic() - started)
+                if remaining > 0:
+                    sleep(remaining)
+    except Exception as e:
+        NotificationJob.objects.filter(pk=job.pk).update(status=NotificationJob.FAILED, error=str(e))
+        raise
+    NotificationJob.objects.filter(pk=job.pk).update(status=NotificationJob.DONE)
+    return sent
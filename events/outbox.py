@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import ChangeEntry
+
+
+EVENT_FIELDS = [
+    'name', 'description', 'starts_at', 'ends_at', 'location', 'latitude', 'longitude',
+    'category_id', 'recurrence_rule',
+]
+CATEGORY_FIELDS = ['name', 'description']
+PARTICIPANT_FIELDS = ['name', 'email']
+
+
+def _snapshot(instance, fields):
+    return {'id': instance.pk, **{field: getattr(instance, field) for field in fields}}
+
+
+def record_saved(entity, instance, fields, created):
+    ChangeEntry.objects.create(
+        entity=entity,
+        key=str(instance.pk),
+        action=ChangeEntry.CREATE if created else ChangeEntry.UPDATE,
+        payload=_snapshot(instance, fields),
+    )
+
+
+def record_deleted(entity, ids, **extra):
+    """Tombstones for rows removed by id, in one INSERT"""
+    ChangeEntry.objects.bulk_create([
+        ChangeEntry(entity=entity, key=str(pk), action=ChangeEntry.DELETE, payload={'id': pk, **extra})
+        for pk in ids
+    ])
+
+
+def record_registrations(pairs, added):
+    """``pairs`` are ``(participant_id, event_id)`` tuples added or removed"""
+    ChangeEntry.objects.bulk_create([
+        ChangeEntry(
+            entity=ChangeEntry.REGISTRATION,
+            key=f'{participant_id}:{event_id}',
+            action=ChangeEntry.CREATE if added else ChangeEntry.DELETE,
+            payload={'participant_id': participant_id, 'event_id': event_id},
+        )
+        for participant_id, event_id in pairs
+    ])
+
+
+def changes_since(cursor, limit=500, entity=None):
+    """Up to ``limit`` entries after ``cursor``, oldest first.
+
+    Entries younger than CHANGE_FEED_SETTLE_SECONDS are held back: with
+    concurrent writers a lower id can commit after a higher one, and a
+    consumer that had already moved its cursor past it would miss it.
+    """
+    settle = getattr(settings, 'CHANGE_FEED_SETTLE_SECONDS', 2)
+    queryset = ChangeEntry.objects.filter(id__gt=cursor)
+    if entity:
+        queryset = queryset.filter(entity=entity)
+    if settle:
+        queryset = queryset.filter(created_at__lte=timezone.now() - timedelta(seconds=settle))
+    return list(queryset.order_by('id')[:limit])
+
+
+def serialize(entry):
+    return {
+        'cursor': entry.pk,
+        'entity': entry.entity,
+        'key': entry.key,
+        'action': entry.action,
+        'data': entry.payload,
+        'at': entry.created_at.isoformat(),
+    }
+
+
+def compact(older_than=None, batch_size=1000):
+    """Delete entries older than ``older_than`` that a newer entry for the
+    same object supersedes. A consumer replaying from any cursor still ends
+    up with the latest state, so no cursor is invalidated."""
+    if older_than is None:
+        older_than = timezone.now() - timedelta(days=getattr(settings, 'CHANGE_FEED_COMPACT_AFTER_DAYS', 7))
+    newer = ChangeEntry.objects.filter(entity=OuterRef('entity'), key=OuterRef('key'), id__gt=OuterRef('id'))
+    superseded = ChangeEntry.objects.filter(created_at__lt=older_than).filter(Exists(newer)).order_by('id')
+    deleted = 0
+    while True:
+        ids = list(superseded.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += ChangeEntry.objects.filter(id__in=ids)._raw_delete(ChangeEntry.objects.db)
@@ -0,0 +1,339 @@
+import calendar
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils import timezone
+
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY')
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+PERIOD_DAYS = {'DAILY': 1, 'WEEKLY': 7, 'MONTHLY': 31}
+
+# Bounds on series length, so finding the last occurrence on save stays cheap
+MAX_COUNT = 1000
+MAX_UNTIL_YEARS = 100
+
+
+# Longest window a single request expands series over
+MAX_WINDOW_DAYS = 366
+
+
+def window_days():
+    """Default horizon for expanding series when a window has no end"""
+    return getattr(settings, 'RECURRENCE_WINDOW_DAYS', 90)
+
+
+def parse_rule(rule):
+    """Parse the supported RRULE subset (FREQ=DAILY|WEEKLY|MONTHLY, INTERVAL,
+    COUNT, UNTIL, BYDAY on weekly rules), raising ValidationError otherwise"""
+    parts = {}
+    for part in filter(None, (rule or '').strip().upper().removeprefix('RRULE:').split(';')):
+        key, sep, value = part.partition('=')
+        if not sep or not value:
+            raise ValidationError(f'Invalid recurrence rule part "{part}".')
+        parts[key] = value
+
+    freq = parts.pop('FREQ', None)
+    if freq not in FREQUENCIES:
+        raise ValidationError('Recurrence FREQ must be DAILY, WEEKLY or MONTHLY.')
+    parsed = {'freq': freq, 'interval': 1, 'count': None, 'until': None, 'byday': None}
+
+    try:
+        if 'INTERVAL' in parts:
+            parsed['interval'] = int(parts.pop('INTERVAL'))
+        if 'COUNT' in parts:
+            parsed['count'] = int(parts.pop('COUNT'))
+    except ValueError:
+        raise ValidationError('Recurrence INTERVAL and COUNT must be whole numbers.')
+    if parsed['interval'] < 1 or (parsed['count'] is not None and parsed['count'] < 1):
+        raise ValidationError('Recurrence INTERVAL and COUNT must be at least 1.')
+    if parsed['count'] is not None and parsed['count'] > MAX_COUNT:
+        raise ValidationError(f'Recurrence COUNT cannot be more than {MAX_COUNT}.')
+
+    if 'UNTIL' in parts:
+        value = parts.pop('UNTIL')
+        try:
+            if 'T' in value:
+                until = datetime.strptime(value.rstrip('Z'), '%Y%m%dT%H%M%S')
+                parsed['until'] = timezone.make_aware(until, dt_timezone.utc if value.endswith('Z') else None)
+            else:
+                # Date-only UNTIL includes the whole local day
+                until = datetime.strptime(value, '%Y%m%d') + timedelta(days=1, microseconds=-1)
+                parsed['until'] = timezone.make_aware(until)
+        except (ValueError, OverflowError):
+            raise ValidationError('Recurrence UNTIL must be YYYYMMDD or YYYYMMDDTHHMMSSZ.')
+        if parsed['until'] > timezone.now() + timedelta(days=365 * MAX_UNTIL_YEARS):
+            raise ValidationError(f'Recurrence UNTIL must be within {MAX_UNTIL_YEARS} years.')
+    if parsed['count'] and parsed['until']:
+        raise ValidationError('Recurrence rules cannot have both COUNT and UNTIL.')
+
+    if 'BYDAY' in parts:
+        days = parts.pop('BYDAY').split(',')
+        if freq != 'WEEKLY' or any(day not in WEEKDAYS for day in days):
+            raise ValidationError('BYDAY is only supported on WEEKLY rules, as MO,TU,...,SU.')
+        parsed['byday'] = sorted({WEEKDAYS.index(day) for day in days})
+
+    if parts:
+        raise ValidationError(f'Unsupported recurrence rule parts: {", ".join(sorted(parts))}.')
+    return parsed
+
+
+def ics_rule(rule):
+    """The rule as an iCalendar RRULE value, with UNTIL in UTC as RFC 5545
+    requires alongside a TZID DTSTART"""
+    parsed = parse_rule(rule)
+    parts = [f'FREQ={parsed["freq"]}']
+    if parsed['interval'] != 1:
+        parts.append(f'INTERVAL={parsed["interval"]}')
+    if parsed['count']:
+        parts.append(f'COUNT={parsed["count"]}')
+    if parsed['until']:
+        parts.append(f'UNTIL={parsed["until"].astimezone(dt_timezone.utc):%Y%m%dT%H%M%SZ}')
+    if parsed['byday']:
+        parts.append('BYDAY=' + ','.join(WEEKDAYS[day] for day in parsed['byday']))
+    return ';'.join(parts)
+
+
+def _local_dates(rule, first_day, skip_to=None):
+    """Yield candidate local dates in order, jumping straight to the period
+    containing ``skip_to`` when the rule has no COUNT to keep track of"""
+    interval = rule['interval']
+    freq = rule['freq']
+    start_period = 0
+    if skip_to and not rule['count'] and skip_to > first_day:
+        if freq == 'DAILY':
+            start_period = (skip_to - first_day).days // interval
+        elif freq == 'WEEKLY':
+            start_period = (skip_to - first_day).days // (7 * interval)
+        else:
+            months = (skip_to.year - first_day.year) * 12 + skip_to.month - first_day.month
+            start_period = max(months // interval - 1, 0)
+
+    period = start_period
+    while True:
+        if freq == 'DAILY':
+            yield first_day + timedelta(days=period * interval)
+        elif freq == 'WEEKLY':
+            week = first_day - timedelta(days=first_day.weekday()) + timedelta(weeks=period * interval)
+            for weekday in rule['byday'] or [first_day.weekday()]:
+                day = week + timedelta(days=weekday)
+                if day >= first_day:
+                    yield day
+        else:
+            month_index = first_day.month - 1 + period * interval
+            year, month = first_day.year + month_index // 12, month_index % 12 + 1
+            # Months without this day are skipped, as RFC 5545 requires
+            if first_day.day <= calendar.monthrange(year, month)[1]:
+                yield first_day.replace(year=year, month=month)
+        period += 1
+
+
+def iter_starts(starts_at, rule, window_start=None, window_end=None):
+    """Generate occurrence start datetimes of a series inside [window_start, window_end).
+
+    Wall-clock time is kept constant in the local timezone across DST changes.
+    """
+    if isinstance(rule, str):
+        rule = parse_rule(rule)
+    local_start = timezone.localtime(starts_at)
+    wall_time = local_start.time().replace(tzinfo=None)
+    skip_to = timezone.localdate(window_start) if window_start else None
+
+    emitted = 0
+    for day in _local_dates(rule, local_start.date(), skip_to):
+        occurrence = timezone.make_aware(datetime.combine(day, wall_time))
+        if rule['until'] and occurrence > rule['until']:
+            return
+        if window_end and occurrence >= window_end:
+            return
+        emitted += 1
+        if rule['count'] and emitted > rule['count']:
+            return
+        if window_start is None or occurrence >= window_start:
+            yield occurrence
+
+
+def last_start(starts_at, rule):
+    """Start of the final occurrence, or None for a series without an end.
+
+    COUNT rules are walked (at most MAX_COUNT occurrences). UNTIL rules are
+    expanded only in a window just before UNTIL, widened until it holds an
+    occurrence, so the cost doesn't grow with the length of the series.
+    """
+    rule = parse_rule(rule)
+    if rule['count']:
+        last = None
+        for last in iter_starts(starts_at, rule):
+            pass
+        return last or starts_at
+    if not rule['until']:
+        return None
+
+    lookback = timedelta(days=PERIOD_DAYS[rule['freq']] * rule['interval'])
+    while True:
+        window_start = rule['until'] - lookback
+        last = None
+        for last in iter_starts(starts_at, rule, window_start):
+            pass
+        if last or window_start <= starts_at:
+            return last or starts_at
+        lookback *= 2
+
+
+class Occurrence:
+    """One expanded occurrence of a series, shaped like an Event for templates"""
+    is_archived = False
+    is_occurrence = True
+
+    def __init__(self, event, starts_at, override=None, now=None):
+        self.event = event
+        self.pk = event.pk
+        self.original_start = starts_at
+        self.starts_at = override.starts_at if override and override.starts_at else starts_at
+        self.location = override.location if override and override.location else event.location
+        self.latitude = event.latitude
+        self.longitude = event.longitude
+        if hasattr(event, 'distance_km'):
+            self.distance_km = event.distance_km
+        self.name = event.name
+        self.description = event.description
+        self.category = event.category
+        self.participants = event.participants
+        self.registration_count = 0
+        self._now = now or timezone.now()
+
+    @property
+    def date(self):
+        return timezone.localdate(self.starts_at)
+
+    @property
+    def time(self):
+        return timezone.localtime(self.starts_at).time()
+
+    @property
+    def is_upcoming(self):
+        return self.starts_at >= self._now
+
+    @property
+    def is_past(self):
+        return not self.is_upcoming
+
+    @property
+    def is_today(self):
+        return self.date == timezone.localdate(self._now)
+
+    @property
+    def occurrence_key(self):
+        return self.original_start.isoformat()
+
+    def get_absolute_url(self):
+        return reverse('event_detail', kwargs={'pk': self.pk}) + '?' + urlencode({'occurrence': self.occurrence_key})
+
+    def __str__(self):
+        return f'{self.name} ({self.starts_at:%Y-%m-%d %H:%M})'
+
+
+def expand(series, window_start, window_end, now=None):
+    """Expand recurring ``series`` into Occurrence objects within the window,
+    applying cancellations and moves from their overrides"""
+    from .models import EventOccurrenceOverride, OccurrenceRegistration
+
+    series = list(series)
+    overrides = {}
+    for override in EventOccurrenceOverride.objects.filter(event__in=series).filter(
+        Q(original_start__gte=window_start, original_start__lt=window_end)
+        | Q(starts_at__gte=window_start, starts_at__lt=window_end)
+    ):
+        overrides[override.event_id, override.original_start] = override
+
+    occurrences = []
+    for event in series:
+        seen = set()
+        for start in iter_starts(event.starts_at, event.recurrence_rule, window_start, window_end):
+            seen.add(start)
+            override = overrides.get((event.pk, start))
+            if override and override.cancelled:
+                continue
+            occurrence = Occurrence(event, start, override, now)
+            if window_start <= occurrence.starts_at < window_end:
+                occurrences.append(occurrence)
+        # Occurrences moved into the window from outside it
+        for (event_id, original_start), override in overrides.items():
+            if event_id == event.pk and original_start not in seen and not override.cancelled \
+                    and override.starts_at and window_start <= override.starts_at < window_end:
+                occurrences.append(Occurrence(event, original_start, override, now))
+    occurrences.sort(key=lambda occurrence: occurrence.starts_at)
+
+    if occurrences:
+        counts = {
+            (row['event_id'], row['occurrence_start']): row['n']
+            for row in OccurrenceRegistration.objects.filter(
+                event__in=series,
+                occurrence_start__gte=min(occurrence.original_start for occurrence in occurrences),
+                occurrence_start__lte=max(occurrence.original_start for occurrence in occurrences),
+            ).values('event_id', 'occurrence_start').annotate(n=Count('id')).order_by()
+        }
+        for occurrence in occurrences:
+            occurrence.registration_count = counts.get((occurrence.pk, occurrence.original_start), 0)
+    return occurrences
+
+
+def capped_window_end(window_start, window_end):
+    """Bound how far one request expands series, however wide the window:
+    occurrences are built in memory, one-off events are not"""
+    return min(window_end, window_start + timedelta(days=MAX_WINDOW_DAYS))
+
+
+def series_in_window(queryset, window_start, window_end):
+    """Recurring series that can have occurrences in the window; a range
+    filter on starts_at/recurrence_end, so cost scales with series count"""
+    return queryset.exclude(recurrence_rule='').filter(
+        Q(recurrence_end__gte=window_start) | Q(recurrence_end__isnull=True),
+        starts_at__lt=window_end,
+    )
+
+
+class OccurrenceMergeResults:
+    """Paginator-compatible merge of a queryset of one-off events with a
+    sorted list of occurrences, fetching only the queryset rows a page needs.
+
+    For a slice [start:stop) at most ``stop - start + len(occurrences)``
+    queryset rows are read. Ties go to the queryset row.
+    """
+
+    def __init__(self, queryset, occurrences):
+        self.queryset = queryset
+        self.occurrences = occurrences
+        self._starts = [occurrence.starts_at for occurrence in occurrences]
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.queryset.count() + len(self.occurrences)
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start = key.start or 0
+        stop = self.count() if key.stop is None else key.stop
+        first = max(start - len(self.occurrences), 0)
+        rows = list(self.queryset[first:stop])
+        row_starts = [row.starts_at for row in rows]
+
+        positioned = []
+        for offset, row in enumerate(rows):
+            positioned.append((first + offset + bisect_left(self._starts, row.starts_at), row))
+        for index, occurrence in enumerate(self.occurrences):
+            position = index + first + bisect_right(row_starts, occurrence.starts_at)
+            positioned.append((position, occurrence))
+        positioned.sort(key=lambda item: item[0])
+        return [item for position, item in positioned if start <= position < stop]
@@ -0,0 +1,42 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Category
+
+
+CATEGORY_VERSION_KEY = 'refdata:categories:version'
+
+# Per-process copy: (version, [(id, name), ...])
+_categories = (None, [])
+
+
+def bump_categories():
+    """Invalidate every process's copy once the category write commits"""
+    transaction.on_commit(lambda: cache.set(CATEGORY_VERSION_KEY, time.time_ns(), None))
+
+
+def categories():
+    """``(id, name)`` pairs ordered by name, reloaded only when the shared
+    version key has changed since this process last read the table"""
+    global _categories
+    # One round-trip on the hot path; only a missing key costs more
+    version = cache.get(CATEGORY_VERSION_KEY)
+    if version is None:
+        # A fresh token (not a counter) if the key was evicted, so a
+        # process can never mistake a restarted version for the one it holds
+        cache.add(CATEGORY_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATEGORY_VERSION_KEY)
+    cached_version, rows = _categories
+    if version is None or version != cached_version:
+        rows = list(Category.objects.order_by('name').values_list('id', 'name'))
+        _categories = (version, rows)
+    return rows
+
+
+def category_choices(empty_label=None):
+    choices = list(categories())
+    if empty_label is not None:
+        choices.insert(0, ('', empty_label))
+    return choices
@@ -0,0 +1,130 @@
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Min
+
+from .models import Event, SuggestionTerm
+
+
+MAX_TOKEN_LENGTH = 100
+SUGGEST_VERSION_KEY = 'suggest:version'
+
+_word_re = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Lower-case, strip accents and collapse whitespace"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(_word_re.findall(text.lower()))
+
+
+def tokens(text):
+    """Every word of ``text`` plus the whole phrase, so both "center" and
+    "tech cen" find "Tech Center" """
+    phrase = normalize(text)
+    if not phrase:
+        return set()
+    return {token[:MAX_TOKEN_LENGTH] for token in phrase.split(' ') + [phrase]}
+
+
+def _terms(name, location):
+    terms = Counter()
+    for kind, text in ((SuggestionTerm.NAME, name), (SuggestionTerm.LOCATION, location)):
+        for token in tokens(text):
+            terms[token, text, kind] += 1
+    return terms
+
+
+def _apply(terms, sign):
+    if not terms:
+        return
+    with transaction.atomic():
+        if sign > 0:
+            SuggestionTerm.objects.bulk_create(
+                [SuggestionTerm(token=t, text=x, kind=k) for t, x, k in terms],
+                ignore_conflicts=True,
+            )
+        for (token, text, kind), count in terms.items():
+            SuggestionTerm.objects.filter(token=token, text=text, kind=kind).update(
+                event_count=F('event_count') + sign * count
+            )
+        if sign < 0:
+            SuggestionTerm.objects.filter(
+                token__in={token for token, _, _ in terms}, event_count__lte=0
+            ).delete()
+    transaction.on_commit(_bump_version)
+
+
+def _bump_version():
+    try:
+        cache.incr(SUGGEST_VERSION_KEY)
+    except ValueError:
+        cache.set(SUGGEST_VERSION_KEY, 1, None)
+
+
+def index_event(name, location):
+    _apply(_terms(name, location), 1)
+
+
+def unindex_event(name, location):
+    _apply(_terms(name, location), -1)
+
+
+def unindex_rows(rows):
+    """Drop events deleted in bulk; ``rows`` are dicts with name/location"""
+    terms = Counter()
+    for row in rows:
+        terms.update(_terms(row['name'], row['location']))
+    _apply(terms, -1)
+
+
+def rebuild():
+    """Recreate the whole index from the Event table"""
+    terms = Counter()
+    for row in Event.objects.values('name', 'location').iterator(chunk_size=2000):
+        terms.update(_terms(row['name'], row['location']))
+    with transaction.atomic():
+        SuggestionTerm.objects.all().delete()
+        SuggestionTerm.objects.bulk_create(
+            [SuggestionTerm(token=t, text=x, kind=k, event_count=n) for (t, x, k), n in terms.items()],
+            batch_size=2000,
+        )
+        transaction.on_commit(_bump_version)
+    return len(terms)
+
+
+def suggest(query, limit=10):
+    """The ``limit`` most used distinct texts with a token starting with ``query``.
+
+    A range scan on the token index (``prefix <= token < prefix+1``) reads
+    only the terms sharing the prefix, one row per distinct text rather
+    than per event; results are cached per prefix until the index changes.
+    """
+    prefix = normalize(query)[:MAX_TOKEN_LENGTH]
+    if not prefix:
+        return []
+    version = cache.get_or_set(SUGGEST_VERSION_KEY, 1, None)
+    key = f'suggest:{version}:{limit}:' + hashlib.md5(prefix.encode()).hexdigest()
+    results = cache.get(key)
+    if results is not None:
+        return results
+
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    # Several tokens of one text can match ("tech" and "tech center"), so
+    # group per text before limiting. The whole-phrase token carries the
+    # exact event count; a word repeated within the text counts higher.
+    rows = (
+        SuggestionTerm.objects.filter(token__gte=prefix, token__lt=upper)
+        .values('text', 'kind').annotate(events=Min('event_count'))
+        .order_by('-events', 'text', 'kind')[:limit]
+    )
+    results = [{'text': row['text'], 'kind': row['kind'], 'events': row['events']} for row in rows]
+
+    cache.set(key, results, getattr(settings, 'SUGGEST_CACHE_TTL', 300))
+    return results
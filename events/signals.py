@@ -0,0 +1,182 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import analytics, archive, outbox, refdata, search
+from .feeds import bump_events_stamp, bump_participant_stamp, forget_vevents
+from .models import Category, ChangeEntry, Event, EventOccurrenceOverride, Participant
+
+
+# Calendar feed invalidation. Participant feeds are validated against the
+# events stamp too, so event writes never need to look up registrants.
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_event_feeds(sender, instance, **kwargs):
+    forget_vevents(instance.pk)
+    bump_events_stamp()
+
+
+@receiver([post_save, post_delete], sender=EventOccurrenceOverride)
+def invalidate_series_feeds(sender, instance, **kwargs):
+    # The series' VEVENT block carries its EXDATE/RECURRENCE-ID lines
+    forget_vevents(instance.event_id)
+    bump_events_stamp()
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_feeds(sender, instance, created, **kwargs):
+    # Cached VEVENT blocks carry the category name
+    if not created:
+        forget_vevents(*Event.objects.filter(category=instance).values_list('id', flat=True))
+    bump_events_stamp()
+
+
+@receiver(post_delete, sender=Category)
+def invalidate_deleted_category_feeds(sender, instance, **kwargs):
+    bump_events_stamp()
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_choices(sender, instance, **kwargs):
+    refdata.bump_categories()
+
+
+@receiver([post_save, post_delete], sender=Participant)
+def invalidate_participant_feed(sender, instance, **kwargs):
+    # The feed is named after the participant, and a deleted participant's
+    # cascaded registrations send no m2m_changed
+    bump_participant_stamp(instance.pk)
+
+
+@receiver(m2m_changed, sender=Participant.events.through)
+def invalidate_registration_feeds(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        bump_participant_stamp(instance.pk)
+    elif action == 'pre_clear':
+        bump_participant_stamp(*instance.participants.values_list('id', flat=True))
+    else:
+        bump_participant_stamp(*pk_set)
+
+
+# Analytics rollup (DailyCategoryStats)
+
+@receiver(post_save, sender=Event)
+def rollup_event_saved(sender, instance, created, **kwargs):
+    if created:
+        analytics.event_scheduled(instance.starts_at, instance.category_id)
+    else:
+        old_starts_at = getattr(instance, '_loaded_starts_at', None)
+        old_category_id = getattr(instance, '_loaded_category_id', None)
+        old_key = (timezone.localdate(old_starts_at), old_category_id) if old_starts_at else None
+        if old_key and old_key != (timezone.localdate(instance.starts_at), instance.category_id):
+            registrations = instance.participants.count()
+            analytics.event_scheduled(old_starts_at, old_category_id, -1, registrations)
+            analytics.event_scheduled(instance.starts_at, instance.category_id, 1, registrations)
+    instance._loaded_starts_at = instance.starts_at
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(pre_delete, sender=Event)
+def rollup_event_deleted(sender, instance, **kwargs):
+    analytics.event_scheduled(
+        instance.starts_at, instance.category_id, -1, instance.participants.count()
+    )
+
+
+@receiver(m2m_changed, sender=Participant.events.through)
+def rollup_registrations(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # Remember what is about to be cleared; post_clear has no pk_set
+        if reverse:
+            instance._cleared_registrations = {
+                (instance.starts_at, instance.category_id): instance.participants.count()
+            }
+        else:
+            instance._cleared_registrations = analytics.event_keys(instance.events.values('id'))
+    elif action == 'post_clear':
+        analytics.registrations_changed(getattr(instance, '_cleared_registrations', {}), -1)
+    elif action in ('post_add', 'post_remove') and pk_set:
+        if reverse:
+            events = {(instance.starts_at, instance.category_id): len(pk_set)}
+        else:
+            events = analytics.event_keys(pk_set)
+        analytics.registrations_changed(events, 1 if action == 'post_add' else -1)
+
+
+@receiver(pre_delete, sender=Participant)
+def rollup_participant_deleted(sender, instance, **kwargs):
+    # The cascade removes the participant's registrations without m2m_changed
+    events = analytics.event_keys(instance.events.values('id'))
+    archived = list(instance.archived_events.values_list('starts_at', 'category_id'))
+    events.update(archived)
+    analytics.registrations_changed(events, -1)
+    archive.registrations_removed(starts_at for starts_at, _ in archived)
+
+
+# Type-ahead suggestion index
+
+@receiver(post_save, sender=Event)
+def index_event_saved(sender, instance, created, **kwargs):
+    old_name = getattr(instance, '_loaded_name', None)
+    old_location = getattr(instance, '_loaded_location', None)
+    if created:
+        search.index_event(instance.name, instance.location)
+    elif old_name is not None and (old_name, old_location) != (instance.name, instance.location):
+        search.unindex_event(old_name, old_location)
+        search.index_event(instance.name, instance.location)
+    instance._loaded_name = instance.name
+    instance._loaded_location = instance.location
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event_deleted(sender, instance, **kwargs):
+    search.unindex_event(instance.name, instance.location)
+
+
+# Change outbox. Saves are wrapped in a transaction (AtomicSaveMixin) and
+# deletes and m2m changes already run in one, so each entry commits with
+# the change it records. A delete writes tombstones only for the rows
+# deleted by id (events, categories, participants): registrations removed
+# along with them get no entries of their own, whether the delete goes
+# through the model, the admin or the chunked deletes in deletion.py.
+
+OUTBOX_MODELS = {
+    Event: (ChangeEntry.EVENT, outbox.EVENT_FIELDS),
+    Category: (ChangeEntry.CATEGORY, outbox.CATEGORY_FIELDS),
+    Participant: (ChangeEntry.PARTICIPANT, outbox.PARTICIPANT_FIELDS),
+}
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Participant)
+def outbox_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    entity, fields = OUTBOX_MODELS[sender]
+    outbox.record_saved(entity, instance, fields, created)
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Participant)
+def outbox_deleted(sender, instance, **kwargs):
+    outbox.record_deleted(OUTBOX_MODELS[sender][0], [instance.pk])
+
+
+@receiver(m2m_changed, sender=Participant.events.through)
+def outbox_registrations(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove') and pk_set:
+        if reverse:
+            pairs = [(participant_id, instance.pk) for participant_id in pk_set]
+        else:
+            pairs = [(instance.pk, event_id) for event_id in pk_set]
+        outbox.record_registrations(pairs, action == 'post_add')
+    elif action == 'pre_clear':
+        # Runs inside clear()'s transaction, before the rows go
+        lookup = {'event_id': instance.pk} if reverse else {'participant_id': instance.pk}
+        outbox.record_registrations(
+            sender.objects.filter(**lookup).values_list('participant_id', 'event_id'), False
+        )
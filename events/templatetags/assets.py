@@ -0,0 +1,56 @@
+import logging
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+logger = logging.getLogger(__name__)
+
+STYLESHEET = 'css/app.css'
+
+
+def stylesheet_url():
+    """URL of the built Tailwind bundle, or None before `npm run build:css`
+    (and, without DEBUG, collectstatic) has produced it"""
+    if settings.DEBUG:
+        return static(STYLESHEET) if finders.find(STYLESHEET) else None
+    try:
+        return static(STYLESHEET)
+    except ValueError:
+        # No manifest entry: collectstatic has not run since the build
+        return None
+
+
+@lru_cache(maxsize=None)
+def _cdn_fallback():
+    # The Play CDN compiles in the browser from the same config and
+    # component classes the build uses; fine for development, too slow for
+    # production
+    config = (settings.BASE_DIR / 'tailwind.config.js').read_text()
+    source = (settings.BASE_DIR / 'static' / 'src' / 'tailwind.css').read_text()
+    source = '\n'.join(line for line in source.splitlines() if not line.startswith('@tailwind'))
+    return mark_safe(
+        '<script src="https://cdn.tailwindcss.com"></script>\n'
+        f'<script>var module = {{}};\n{config}\ntailwind.config = module.exports;</script>\n'
+        f'<style type="text/tailwindcss">\n{source}\n</style>'
+    )
+
+
+@register.simple_tag
+def app_stylesheet():
+    """Link the built bundle. In development a checkout without the Node.js
+    build falls back to the in-browser compiler; in production a missing
+    bundle is an error (see the events.E001 deploy check), not something
+    to paper over with a JIT compiler in every visitor's browser."""
+    url = stylesheet_url()
+    if url is not None:
+        return format_html('<link rel="stylesheet" href="{}">', url)
+    if settings.DEBUG:
+        return _cdn_fallback()
+    logger.error('%s is missing from the static files; run `npm run build:css` and collectstatic', STYLESHEET)
+    return ''
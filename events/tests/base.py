@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from events.models import Category, Event, Participant
+
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHE,
+    # Pages render without a collectstatic manifest
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+)
+class EventTestCase(TestCase):
+    """Each test starts from an empty private cache"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    @staticmethod
+    def make_category(name='Tech', **kwargs):
+        return Category.objects.create(name=name, description=kwargs.pop('description', 'Talks'), **kwargs)
+
+    @staticmethod
+    def make_event(category, starts_at=None, name='Meetup', **kwargs):
+        starts_at = timezone.localtime(starts_at or timezone.now() + timedelta(days=7))
+        return Event.objects.create(
+            name=name, description=kwargs.pop('description', 'An event'),
+            date=starts_at.date(), time=starts_at.time().replace(microsecond=0),
+            location=kwargs.pop('location', 'Main Hall'), category=category, **kwargs
+        )
+
+    @staticmethod
+    def make_participant(email='ada@example.com', name='Ada', **kwargs):
+        return Participant.objects.create(name=name, email=email, **kwargs)
+
+    @staticmethod
+    def aware(*args):
+        return timezone.make_aware(datetime(*args))
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.urls import reverse
+from django.utils import timezone
+
+from events import analytics
+from events.archive import archive_events, archived_totals
+from events.models import DailyCategoryStats
+
+from .base import EventTestCase
+
+
+class RollupTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = self.make_category()
+        self.event = self.make_event(self.category, self.aware(2030, 1, 15, 10, 0))
+        self.participant = self.make_participant()
+
+    def stats(self, day):
+        return DailyCategoryStats.objects.get(day=day, category=self.category)
+
+    def test_registrations_are_rolled_up(self):
+        self.participant.events.add(self.event)
+        self.make_participant(email='grace@example.com', name='Grace').events.add(self.event)
+        self.participant.events.remove(self.event)
+
+        stats = self.stats(self.event.starts_at.date())
+        self.assertEqual((stats.events_scheduled, stats.active_participants), (1, 1))
+        today = self.stats(timezone.localdate())
+        self.assertEqual((today.registrations_added, today.registrations_removed), (2, 1))
+
+    def test_deleting_a_participant_removes_their_registrations(self):
+        self.participant.events.add(self.event)
+
+        self.participant.delete()
+
+        self.assertEqual(self.stats(self.event.starts_at.date()).active_participants, 0)
+        self.assertEqual(self.stats(timezone.localdate()).registrations_removed, 1)
+
+    def test_deleting_a_participant_removes_archived_registrations(self):
+        old = self.make_event(self.category, self.aware(2024, 1, 15, 10, 0), name='Old meetup')
+        self.participant.events.add(old)
+        archive_events(self.aware(2025, 1, 1, 0, 0))
+
+        self.participant.delete()
+
+        self.assertEqual(self.stats(old.starts_at.date()).active_participants, 0)
+        self.assertEqual(archived_totals()['registrations'], 0)
+        analytics.rebuild()
+        self.assertEqual(self.stats(old.starts_at.date()).active_participants, 0)
+
+    def test_dashboard_logs_rollup_failures(self):
+        with mock.patch.object(analytics, 'recent_activity', side_effect=DatabaseError('locked')), \
+                self.assertLogs('events.views', 'ERROR'):
+            response = self.client.get(reverse('dashboard'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['registration_activity'], [])
@@ -0,0 +1,62 @@
+from datetime import date
+
+from django.urls import reverse
+
+from events.archive import archive_events, archived_totals, reaches_archive
+from events.models import ArchivedEvent, Event
+
+from .base import EventTestCase
+
+
+class ArchiveTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = self.make_category()
+        self.old = self.make_event(self.category, self.aware(2024, 1, 15, 10, 0), name='Old meetup')
+        self.recent = self.make_event(self.category, self.aware(2030, 1, 15, 10, 0), name='Future meetup')
+        self.participant = self.make_participant()
+        self.participant.events.add(self.old)
+
+    def test_archive_moves_events_and_registrations(self):
+        moved = archive_events(self.aware(2025, 1, 1, 0, 0))
+
+        self.assertEqual(moved, (1, 1))
+        self.assertFalse(Event.objects.filter(pk=self.old.pk).exists())
+        archived = ArchivedEvent.objects.get(original_id=self.old.pk)
+        self.assertEqual(list(archived.participants.all()), [self.participant])
+        totals = archived_totals()
+        self.assertEqual((totals['events'], totals['registrations']), (1, 1))
+
+    def test_reaches_archive_with_either_end_open(self):
+        archive_events(self.aware(2025, 1, 1, 0, 0))
+
+        self.assertFalse(reaches_archive())
+        self.assertTrue(reaches_archive(date_from=date(2024, 1, 1)))
+        self.assertTrue(reaches_archive(date_to=date(2024, 2, 1)))
+        self.assertTrue(reaches_archive(date(2023, 1, 1), date(2030, 1, 1)))
+        self.assertFalse(reaches_archive(date_from=date(2024, 2, 1)))
+        self.assertFalse(reaches_archive(date_to=date(2023, 12, 31)))
+
+    def test_list_with_only_date_to_includes_archived_events(self):
+        archive_events(self.aware(2025, 1, 1, 0, 0))
+
+        response = self.client.get(reverse('event_list'), {'date_to': '2024-02-01'})
+        self.assertEqual([event.name for event in response.context['events']], ['Old meetup'])
+
+        response = self.client.get(reverse('event_list'), {'date_to': '2030-12-31'})
+        self.assertEqual([event.name for event in response.context['events']], ['Old meetup', 'Future meetup'])
+
+    def test_hot_events_older_than_archived_ones_are_merged_in_order(self):
+        archive_events(self.aware(2025, 1, 1, 0, 0))
+        # Added after the archive run with an earlier date than archived rows
+        self.make_event(self.category, self.aware(2023, 6, 1, 10, 0), name='Backdated meetup')
+        self.make_event(self.category, self.aware(2024, 1, 20, 10, 0), name='Late January meetup')
+
+        response = self.client.get(reverse('event_list'), {'date_to': '2024-12-31'})
+
+        self.assertEqual(
+            [event.name for event in response.context['events']],
+            ['Backdated meetup', 'Old meetup', 'Late January meetup'],
+        )
+        results = response.context['paginator'].object_list
+        self.assertEqual([event.name for event in results[1:3]], ['Old meetup', 'Late January meetup'])
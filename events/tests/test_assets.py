@@ -0,0 +1,53 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import override_settings
+from django.urls import reverse
+
+from events.checks import check_stylesheet
+
+from .base import EventTestCase
+
+
+MANIFEST_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+
+class StylesheetTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(static_root.cleanup)
+        self.static_root = Path(static_root.name)
+
+    @override_settings(DEBUG=True, STATICFILES_DIRS=[])
+    def test_development_falls_back_to_the_cdn_before_the_css_build(self):
+        with override_settings(STATICFILES_STORAGE=MANIFEST_STORAGE, STATIC_ROOT=self.static_root):
+            response = self.client.get(reverse('event_list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'https://cdn.tailwindcss.com')
+        self.assertContains(response, '.nav-link')
+
+    def test_production_reports_a_missing_bundle(self):
+        with override_settings(STATICFILES_STORAGE=MANIFEST_STORAGE, STATIC_ROOT=self.static_root):
+            with self.assertLogs('events.templatetags.assets', 'ERROR'):
+                response = self.client.get(reverse('event_list'))
+            errors = check_stylesheet(None)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'cdn.tailwindcss.com')
+        self.assertNotContains(response, 'rel="stylesheet"')
+        self.assertEqual([error.id for error in errors], ['events.E001'])
+
+    def test_built_bundle_is_linked_by_its_hashed_name(self):
+        (self.static_root / 'staticfiles.json').write_text(json.dumps({
+            'version': '1.1', 'paths': {'css/app.css': 'css/app.0123abcd.css'},
+        }))
+        with override_settings(STATICFILES_STORAGE=MANIFEST_STORAGE, STATIC_ROOT=self.static_root):
+            response = self.client.get(reverse('event_list'))
+            errors = check_stylesheet(None)
+
+        self.assertContains(response, '<link rel="stylesheet" href="/static/css/app.0123abcd.css">')
+        self.assertNotContains(response, 'cdn.tailwindcss.com')
+        self.assertEqual(errors, [])
@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from events.models import Event
+
+from .base import EventTestCase
+
+
+class StartsAtTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = self.make_category()
+
+    def test_save_derives_starts_at_from_date_and_time(self):
+        event = self.make_event(self.category, self.aware(2030, 5, 1, 18, 30))
+        event.refresh_from_db()
+        self.assertEqual(event.starts_at, self.aware(2030, 5, 1, 18, 30))
+
+        event.date = date(2030, 5, 2)
+        event.save(update_fields=['date'])
+        event.refresh_from_db()
+        self.assertEqual(event.starts_at, self.aware(2030, 5, 2, 18, 30))
+
+    def test_is_past_means_started_before_now(self):
+        now = timezone.now()
+        earlier = self.make_event(self.category, now - timedelta(minutes=5), name='Earlier today')
+        later = self.make_event(self.category, now + timedelta(hours=1), name='Later today')
+
+        self.assertTrue(earlier.is_past)
+        self.assertFalse(later.is_past)
+        flags = dict(Event.objects.with_status(now).values_list('name', 'upcoming_flag'))
+        self.assertEqual(flags, {'Earlier today': False, 'Later today': True})
+
+    def test_in_date_range_includes_whole_local_days(self):
+        self.make_event(self.category, self.aware(2030, 5, 1, 0, 0), name='Midnight')
+        self.make_event(self.category, self.aware(2030, 5, 1, 23, 59), name='Late')
+        self.make_event(self.category, self.aware(2030, 5, 2, 0, 0), name='Next day')
+
+        names = Event.objects.in_date_range(date(2030, 5, 1), date(2030, 5, 1)).values_list('name', flat=True)
+        self.assertEqual(sorted(names), ['Late', 'Midnight'])
+
+    def test_event_list_filters_by_date(self):
+        self.make_event(self.category, self.aware(2030, 5, 1, 10, 0), name='In range')
+        self.make_event(self.category, self.aware(2030, 6, 1, 10, 0), name='Out of range')
+
+        response = self.client.get(reverse('event_list'), {'date_from': '2030-05-01', 'date_to': '2030-05-31'})
+        self.assertEqual([event.name for event in response.context['events']], ['In range'])
@@ -0,0 +1,100 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from events.archive import archive_events, archived_totals
+from events.deletion import claim_next_job, delete_category, delete_event, run_deletion_job
+from events.models import ArchivedEvent, ArchiveRollup, Category, DeletionJob, Event, Participant
+
+from .base import EventTestCase
+
+
+@override_settings(CHUNKED_DELETE_BATCH_SIZE=2)
+class ChunkedDeleteTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = self.make_category()
+        self.participants = [
+            self.make_participant(f'p{i}@example.com', f'P{i}') for i in range(3)
+        ]
+        self.events = [
+            self.make_event(self.category, self.aware(2030, 1, day, 10, 0), name=f'Event {day}')
+            for day in range(1, 6)
+        ]
+        for participant in self.participants:
+            participant.events.add(*self.events)
+
+    def test_delete_event_removes_registrations_in_batches(self):
+        deleted = delete_event(self.events[0].pk)
+
+        self.assertEqual(deleted, 1)
+        self.assertFalse(Event.objects.filter(pk=self.events[0].pk).exists())
+        self.assertEqual(Event.participants.through.objects.count(), 12)
+        self.assertEqual(Participant.objects.count(), 3)
+
+    def test_delete_category_removes_hot_and_archived_events(self):
+        old = self.make_event(self.category, self.aware(2024, 1, 15, 10, 0), name='Old')
+        self.participants[0].events.add(old)
+        archive_events(self.aware(2025, 1, 1, 0, 0))
+        self.assertEqual(archived_totals()['events'], 1)
+
+        delete_category(self.category.pk)
+
+        self.assertFalse(Category.objects.exists())
+        self.assertFalse(Event.objects.exists())
+        self.assertFalse(ArchivedEvent.objects.exists())
+        self.assertFalse(Event.participants.through.objects.exists())
+        self.assertEqual(Participant.objects.count(), 3)
+        # The dashboard's archived totals come from the rollup alone
+        self.assertFalse(ArchiveRollup.objects.exists())
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual((response.context['total_events'], response.context['past_events']), (0, 0))
+
+    def test_confirmation_counts_everything_that_will_be_deleted(self):
+        old = self.make_event(self.category, self.aware(2024, 1, 15, 10, 0), name='Old')
+        self.participants[0].events.add(old)
+        archive_events(self.aware(2025, 1, 1, 0, 0))
+
+        response = self.client.get(reverse('category_delete', args=[self.category.pk]))
+
+        counts = {key: response.context[key] for key in (
+            'event_count', 'registration_count', 'archived_event_count', 'archived_registration_count',
+            'total_event_count', 'total_registration_count',
+        )}
+        self.assertEqual(counts, {
+            'event_count': 5, 'registration_count': 15, 'archived_event_count': 1,
+            'archived_registration_count': 1, 'total_event_count': 6, 'total_registration_count': 16,
+        })
+        # Six event days plus today's registrations_added row
+        self.assertEqual(response.context['stats_day_count'], 7)
+        self.assertContains(response, '1 archived event')
+        self.assertContains(response, 'all 16 associated participant registrations')
+
+    def test_jobs_are_claimed_once(self):
+        job = DeletionJob.objects.create(
+            target=DeletionJob.CATEGORY, target_id=self.category.pk, label=self.category.name, total=5
+        )
+
+        claimed = claim_next_job()
+        self.assertEqual(claimed, job)
+        self.assertEqual(claimed.status, DeletionJob.RUNNING)
+        self.assertIsNone(claim_next_job())
+
+        run_deletion_job(claimed)
+        claimed.refresh_from_db()
+        self.assertEqual((claimed.status, claimed.deleted), (DeletionJob.DONE, 5))
+        self.assertFalse(Category.objects.exists())
+
+
+class BackgroundJobsTests(EventTestCase):
+    def test_run_background_jobs_drains_the_deletion_queue(self):
+        category = self.make_category()
+        self.make_event(category)
+        DeletionJob.objects.create(target=DeletionJob.CATEGORY, target_id=category.pk, label=category.name, total=1)
+
+        call_command('run_background_jobs', once=True, daily_hour=24, stdout=StringIO())
+
+        self.assertEqual(DeletionJob.objects.get().status, DeletionJob.DONE)
+        self.assertFalse(Event.objects.exists())
@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .base import EventTestCase
+
+
+def content(response):
+    if response.streaming:
+        return b''.join(response.streaming_content).decode()
+    return response.content.decode()
+
+
+class ParticipantFeedTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.make_event(self.make_category(), name='Python meetup')
+        self.participant = self.make_participant()
+        self.participant.events.add(self.event)
+        self.url = reverse('participant_feed', args=[self.participant.pk])
+
+    def test_unchanged_feed_is_served_from_the_cache(self):
+        first = self.client.get(self.url)
+        self.assertIn('SUMMARY:Python meetup', content(first))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 0)
+
+    def test_renaming_the_participant_changes_the_feed(self):
+        first = self.client.get(self.url)
+        self.assertIn('X-WR-CALNAME:Ada - Events', content(first))
+
+        self.participant.name = 'Ada Lovelace'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.participant.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('X-WR-CALNAME:Ada Lovelace - Events', content(response))
+
+    def test_deleted_participant_feed_is_gone(self):
+        first = self.client.get(self.url)
+        content(first)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.participant.delete()
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 404)
+
+    def test_stamps_are_bumped_only_when_the_write_commits(self):
+        first = self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.participant.name = 'Ada Lovelace'
+            self.participant.save()
+            # Not committed yet: the cached feed is still current
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        self.assertTrue(callbacks)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
@@ -0,0 +1,56 @@
+import re
+from html import unescape
+from urllib.parse import parse_qs
+
+from django.urls import reverse
+
+from events import geo
+from events.models import Event
+
+from .base import EventTestCase
+
+
+LONDON = (51.5074, -0.1278)
+
+
+class NearTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        category = self.make_category()
+        self.make_event(category, name='Soho meetup', latitude=51.5136, longitude=-0.1365)
+        self.make_event(category, name='Greenwich meetup', latitude=51.4826, longitude=-0.0077)
+        self.make_event(category, name='Paris meetup', latitude=48.8566, longitude=2.3522)
+        self.make_event(category, name='Online meetup')
+
+    def names(self, queryset):
+        return sorted(event.name for event in queryset)
+
+    def test_near_filters_by_exact_distance(self):
+        self.assertEqual(self.names(Event.objects.near(*LONDON, 2)), ['Soho meetup'])
+        self.assertEqual(self.names(Event.objects.near(*LONDON, 15)), ['Greenwich meetup', 'Soho meetup'])
+        events = Event.objects.near(*LONDON, 400)
+        self.assertEqual(len(events), 3)
+        paris = next(event for event in events if event.name == 'Paris meetup')
+        self.assertAlmostEqual(paris.distance_km, geo.distance_km(*LONDON, 48.8566, 2.3522), places=3)
+
+    def test_covering_cells_are_bounded(self):
+        for radius_km in (0.1, 2, 50, 500):
+            with self.subTest(radius_km=radius_km):
+                cells = geo.covering_cells(*LONDON, radius_km)
+                self.assertLessEqual(len(cells), geo.MAX_CELLS)
+                self.assertTrue(any(geo.encode(*LONDON).startswith(cell) for cell in cells))
+
+    def test_pagination_links_keep_the_location_filter(self):
+        category = Event.objects.first().category
+        for i in range(12):
+            self.make_event(category, name=f'Soho talk {i}', latitude=51.5136, longitude=-0.1365)
+
+        response = self.client.get(reverse('event_list'), {
+            'near_lat': LONDON[0], 'near_lng': LONDON[1], 'radius_km': 2, 'page': 1,
+        })
+
+        self.assertEqual(response.context['paginator'].count, 13)
+        query = parse_qs(response.context['page_query'])
+        self.assertEqual(query, {'near_lat': ['51.5074'], 'near_lng': ['-0.1278'], 'radius_km': ['2']})
+        links = {unescape(href) for href in re.findall(r'href="(\?page=2[^"]*)"', response.content.decode())}
+        self.assertEqual(links, {'?page=2&near_lat=51.5074&near_lng=-0.1278&radius_km=2'})
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from events.health import READINESS_CACHE_KEY
+
+from .base import EventTestCase
+
+
+class HealthTests(EventTestCase):
+    def test_liveness_does_not_touch_the_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('health_check'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'healthy')
+        self.assertEqual(len(queries), 0)
+
+    def test_readiness_is_cached(self):
+        response = self.client.get(reverse('health_ready'))
+
+        self.assertEqual(response.status_code, 200)
+        result = response.json()
+        self.assertEqual((result['status'], result['migrations']), ('ready', 'applied'))
+
+        # A second probe inside the TTL returns the cached result
+        response = self.client.get(reverse('health_ready'))
+        self.assertEqual(response.json()['checked_at'], result['checked_at'])
+
+    def test_readiness_reports_failures_as_503(self):
+        cache.set(READINESS_CACHE_KEY, {'status': 'error', 'database': 'down'})
+
+        response = self.client.get(reverse('health_ready'))
+        self.assertEqual(response.status_code, 503)
+
+    def test_metrics_counts_are_cached(self):
+        category = self.make_category()
+        self.make_event(category)
+
+        self.assertEqual(self.client.get(reverse('metrics')).json()['events'], 1)
+
+        self.make_event(category, name='Second meetup')
+        with CaptureQueriesContext(connection) as queries:
+            counts = self.client.get(reverse('metrics')).json()
+        self.assertEqual((counts['events'], counts['categories']), (1, 1))
+        self.assertEqual(len(queries), 0)
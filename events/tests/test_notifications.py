@@ -0,0 +1,96 @@
+from django.core import mail
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from events import deletion, notifications
+from events.models import DeletionJob, Event, NotificationJob
+
+from .base import EventTestCase
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    NOTIFICATION_RATE_LIMIT=0,
+)
+class CancellationTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.make_event(self.make_category(), name='Python meetup')
+        self.participants = [self.make_participant(f'p{i}@example.com', f'P{i}') for i in range(3)]
+        for participant in self.participants:
+            participant.events.add(self.event)
+
+    def run_notifications(self):
+        while (job := notifications.claim_next_job()) is not None:
+            notifications.run_job(job)
+
+    def test_event_is_deleted_inline_and_registrants_are_still_notified(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('event_delete', args=[self.event.pk]))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Event.objects.filter(pk=self.event.pk).exists())
+        self.assertFalse(DeletionJob.objects.exists())
+        job_inserts = [
+            query for query in queries
+            if query['sql'].startswith('INSERT') and '"events_notificationjob"' in query['sql']
+        ]
+        self.assertEqual(len(job_inserts), 1)
+        job = NotificationJob.objects.get(event_id=self.event.pk)
+        self.assertEqual(sorted(job.payload['participant_ids']), [participant.pk for participant in self.participants])
+
+        self.run_notifications()
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ['p0@example.com', 'p1@example.com', 'p2@example.com'],
+        )
+        self.assertTrue(all('Python meetup' in message.subject for message in mail.outbox))
+
+    @override_settings(CHUNKED_DELETE_BACKGROUND_THRESHOLD=2)
+    def test_large_events_are_deleted_in_the_background(self):
+        self.client.post(reverse('event_delete', args=[self.event.pk]))
+
+        self.assertTrue(Event.objects.filter(pk=self.event.pk).exists())
+        deletion.run_deletion_job(deletion.claim_next_job())
+        self.assertFalse(Event.objects.filter(pk=self.event.pk).exists())
+
+        self.run_notifications()
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_event_without_registrants_is_deleted_immediately(self):
+        event = self.make_event(self.event.category, name='Empty meetup')
+
+        self.client.post(reverse('event_delete', args=[event.pk]))
+
+        self.assertFalse(Event.objects.filter(pk=event.pk).exists())
+        self.assertFalse(NotificationJob.objects.filter(event_id=event.pk).exists())
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    NOTIFICATION_RATE_LIMIT=0,
+)
+class EmailBodyTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = self.make_event(self.make_category(), name='Rock & Roll "Night"', location="O'Malley's")
+        self.make_participant('ann@example.com', "Ann O'Brien").events.add(self.event)
+
+    def test_plain_text_bodies_are_not_html_escaped(self):
+        notifications.enqueue_change(self.event)
+        # Skip the debounce delay
+        NotificationJob.objects.update(run_after=timezone.now())
+        notifications.run_job(notifications.claim_next_job())
+        self.client.post(reverse('event_delete', args=[self.event.pk]))
+        notifications.run_job(notifications.claim_next_job())
+
+        self.assertEqual(len(mail.outbox), 2)
+        for message in mail.outbox:
+            self.assertIn("Hi Ann O'Brien,", message.body)
+            self.assertIn('"Rock & Roll "Night""', message.body)
+            self.assertIn("O'Malley's", message.body)
+            self.assertNotIn('&#x27;', message.body)
+            self.assertNotIn('&amp;', message.body)
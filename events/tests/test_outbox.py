@@ -0,0 +1,81 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from django.urls import reverse
+
+from events.deletion import delete_category, delete_event
+from events.models import Category, ChangeEntry
+
+from .base import EventTestCase
+
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangeFeedTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = self.make_category()
+        self.event = self.make_event(self.category)
+        self.participant = self.make_participant()
+        self.participant.events.add(self.event)
+        self.cursor = ChangeEntry.objects.latest('id').pk
+
+    def changes(self):
+        response = self.client.get(reverse('change_feed'), {'since': self.cursor})
+        return [(change['entity'], change['action'], change['key']) for change in response.json()['changes']]
+
+    def test_writes_and_registrations_are_recorded(self):
+        self.participant.events.remove(self.event)
+        self.event.name = 'Renamed'
+        self.event.save()
+
+        self.assertEqual(self.changes(), [
+            (ChangeEntry.REGISTRATION, ChangeEntry.DELETE, f'{self.participant.pk}:{self.event.pk}'),
+            (ChangeEntry.EVENT, ChangeEntry.UPDATE, str(self.event.pk)),
+        ])
+
+    def test_deletes_write_tombstones_for_deleted_rows_only(self):
+        other = self.make_participant('grace@example.com', 'Grace')
+        other.events.add(self.event)
+        self.cursor = ChangeEntry.objects.latest('id').pk
+
+        participant_id = self.participant.pk
+        delete_event(self.event.pk)
+        self.participant.delete()
+
+        self.assertEqual(self.changes(), [
+            (ChangeEntry.EVENT, ChangeEntry.DELETE, str(self.event.pk)),
+            (ChangeEntry.PARTICIPANT, ChangeEntry.DELETE, str(participant_id)),
+        ])
+
+    def test_category_delete_writes_event_and_category_tombstones(self):
+        delete_category(self.category.pk)
+
+        self.assertEqual(self.changes(), [
+            (ChangeEntry.EVENT, ChangeEntry.DELETE, str(self.event.pk)),
+            (ChangeEntry.CATEGORY, ChangeEntry.DELETE, str(self.category.pk)),
+        ])
+
+    def test_rolled_back_save_records_nothing(self):
+        music = self.make_category('Music')
+        self.cursor = ChangeEntry.objects.latest('id').pk
+
+        music.name = 'TECH'
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            music.save()
+
+        self.assertEqual(self.changes(), [])
+
+
+class ChangeFeedBenchmarkTests(EventTestCase):
+    def test_queries_are_counted_when_the_query_log_is_full(self):
+        connection.queries_log.extend({'sql': 'SELECT 1', 'time': '0.000'} for _ in range(connection.queries_limit))
+        out = StringIO()
+        call_command('benchmark_change_feed', rows=2, stdout=out)
+
+        lines = out.getvalue().splitlines()[1:-1]
+        self.assertEqual(len(lines), 8)
+        for line in lines:
+            self.assertNotEqual(line.split()[-1], '0.0', line)
+        self.assertFalse(Category.objects.exists())
@@ -0,0 +1,79 @@
+import time
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils import timezone
+
+from events import recurrence
+from events.forms import EventForm
+
+from .base import EventTestCase
+
+
+class RecurrenceTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = self.make_category()
+        self.start = self.aware(2030, 1, 31, 18, 0)
+
+    def walk(self, rule):
+        return list(recurrence.iter_starts(self.start, rule))[-1]
+
+    def test_last_start_of_until_rules_matches_full_expansion(self):
+        for rule in [
+            'FREQ=DAILY;INTERVAL=3;UNTIL=20300401',
+            'FREQ=WEEKLY;BYDAY=MO,FR;UNTIL=20310115',
+            # Months without a 31st are skipped, so the lookback has to widen
+            'FREQ=MONTHLY;UNTIL=20310330',
+            'FREQ=MONTHLY;INTERVAL=5;UNTIL=20340101T000000Z',
+        ]:
+            with self.subTest(rule=rule):
+                self.assertEqual(recurrence.last_start(self.start, rule), self.walk(rule))
+
+    def test_long_until_rule_saves_without_walking_the_series(self):
+        until = (timezone.now() + timedelta(days=365 * 99)).strftime('%Y%m%d')
+        started = time.perf_counter()
+        event = self.make_event(self.category, self.start, recurrence_rule=f'FREQ=DAILY;UNTIL={until}')
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(timezone.localdate(event.recurrence_end).strftime('%Y%m%d'), until)
+
+    def test_unbounded_series_lengths_are_rejected(self):
+        for rule in ['FREQ=DAILY;COUNT=300000', 'FREQ=DAILY;UNTIL=99991231', 'FREQ=DAILY;UNTIL=99991231T235959Z']:
+            with self.subTest(rule=rule), self.assertRaises(ValidationError):
+                recurrence.parse_rule(rule)
+        self.assertEqual(recurrence.parse_rule('FREQ=DAILY;COUNT=1000')['count'], 1000)
+
+    def test_form_and_model_validation_report_the_rule(self):
+        form = EventForm(data={
+            'name': 'Standup', 'description': 'Daily', 'date': '2030-01-31', 'time': '18:00',
+            'recurrence_rule': 'FREQ=DAILY;COUNT=300000', 'location': 'Main Hall', 'category': self.category.pk,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('recurrence_rule', form.errors)
+
+        event = self.make_event(self.category, self.start)
+        event.recurrence_rule = 'FREQ=DAILY;UNTIL=99991231'
+        with self.assertRaises(ValidationError) as raised:
+            event.full_clean()
+        self.assertIn('recurrence_rule', raised.exception.message_dict)
+
+
+class OccurrenceListTests(EventTestCase):
+    def test_wide_date_ranges_expand_series_for_at_most_a_year(self):
+        category = self.make_category()
+        for i in range(5):
+            self.make_event(category, self.aware(2026, 11, 1, 9 + i, 0), name=f'Standup {i}',
+                            recurrence_rule='FREQ=DAILY')
+        self.make_event(category, self.aware(2090, 6, 1, 10, 0), name='Far future conference')
+
+        started = time.perf_counter()
+        response = self.client.get(reverse('event_list'), {'date_from': '2026-11-01', 'date_to': '2099-12-31'})
+        self.assertLess(time.perf_counter() - started, 2)
+
+        self.assertEqual(response.context['paginator'].count, 5 * recurrence.MAX_WINDOW_DAYS + 1)
+        self.assertEqual(response.context['events'][0].name, 'Standup 0')
+        last_page = self.client.get(reverse('event_list'), {
+            'date_from': '2026-11-01', 'date_to': '2099-12-31', 'page': 'last',
+        })
+        self.assertEqual(last_page.context['events'][-1].name, 'Far future conference')
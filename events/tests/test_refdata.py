@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from events import refdata
+from events.checks import check_shared_cache
+
+from .base import EventTestCase
+
+
+class CategoryChoicesTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tech = self.make_category('Tech')
+        refdata._categories = (None, [])
+
+    def test_choices_are_served_from_the_process_copy(self):
+        self.assertEqual(refdata.categories(), [(self.tech.pk, 'Tech')])
+
+        with CaptureQueriesContext(connection) as queries, \
+                mock.patch.object(refdata.cache, 'get', wraps=refdata.cache.get) as get, \
+                mock.patch.object(refdata.cache, 'add', wraps=refdata.cache.add) as add:
+            self.assertEqual(refdata.categories(), [(self.tech.pk, 'Tech')])
+        self.assertEqual(len(queries), 0)
+        # A single cache read per call once the version key exists
+        self.assertEqual((get.call_count, add.call_count), (1, 0))
+
+    def test_category_writes_reload_the_choices(self):
+        refdata.categories()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            music = self.make_category('Music')
+        self.assertEqual(refdata.categories(), [(music.pk, 'Music'), (self.tech.pk, 'Tech')])
+
+    def test_version_bumped_elsewhere_reloads_the_choices(self):
+        refdata.categories()
+        # Another process wrote a category and bumped the shared version
+        self.make_category('Music')
+        cache.set(refdata.CATEGORY_VERSION_KEY, 'from-another-worker', None)
+
+        self.assertEqual([name for _, name in refdata.categories()], ['Music', 'Tech'])
+
+
+class SharedCacheCheckTests(EventTestCase):
+    def test_per_process_cache_is_flagged(self):
+        self.assertEqual([error.id for error in check_shared_cache(None)], ['events.W001'])
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost:6379',
+    }})
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,57 @@
+from django.urls import reverse
+
+from events import search
+from events.deletion import delete_category
+
+from .base import EventTestCase
+
+
+class SuggestTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = self.make_category()
+        self.event = self.make_event(self.category, name='Café Python Night', location='Tech Center')
+
+    def suggestions(self, query):
+        response = self.client.get(reverse('event_suggest'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [(row['text'], row['kind']) for row in response.json()['suggestions']]
+
+    def test_matches_word_and_phrase_prefixes_without_accents(self):
+        self.assertEqual(self.suggestions('cafe'), [('Café Python Night', 'name')])
+        self.assertEqual(self.suggestions('pyth'), [('Café Python Night', 'name')])
+        self.assertEqual(self.suggestions('Tech cen'), [('Tech Center', 'location')])
+        self.assertEqual(self.suggestions('   '), [])
+
+    def test_renames_and_deletes_update_the_index(self):
+        self.assertEqual(self.suggestions('night'), [('Café Python Night', 'name')])
+
+        self.event.name = 'Django Evening'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.assertEqual(self.suggestions('night'), [])
+        self.assertEqual(self.suggestions('djan'), [('Django Evening', 'name')])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_category(self.category.pk)
+        self.assertEqual(self.suggestions('djan'), [])
+        self.assertEqual(search.rebuild(), 0)
+
+    def test_shared_texts_are_counted_once_per_event(self):
+        self.make_event(self.category, name='Rust Night', location='Tech Center')
+
+        response = self.client.get(reverse('event_suggest'), {'q': 'tech'})
+        self.assertEqual(response.json()['suggestions'], [{'text': 'Tech Center', 'kind': 'location', 'events': 2}])
+
+    def test_most_used_texts_come_first_and_fill_the_limit(self):
+        for i in range(3):
+            self.make_event(self.category, name=f'Tech talk {i}', location='Tech Hub')
+        self.make_event(self.category, name='Techno party', location='Warehouse')
+
+        response = self.client.get(reverse('event_suggest'), {'q': 'tech', 'limit': 3})
+        suggestions = response.json()['suggestions']
+
+        self.assertEqual(len(suggestions), 3)
+        self.assertEqual(suggestions[0], {'text': 'Tech Hub', 'kind': 'location', 'events': 3})
+        self.assertEqual(suggestions[1]['text'], 'Tech Center')
+        self.assertEqual(len({(row['text'], row['kind']) for row in suggestions}), 3)
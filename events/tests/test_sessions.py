@@ -0,0 +1,50 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from events.models import Category
+
+from .base import EventTestCase
+
+
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies',
+    MESSAGE_STORAGE='django.contrib.messages.storage.cookie.CookieStorage',
+)
+class CookieSessionTests(EventTestCase):
+    def test_create_round_trip_never_touches_the_session_table(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(
+                reverse('category_create'), {'name': 'Workshops', 'description': 'Hands-on'}, follow=True
+            )
+
+        self.assertTrue(Category.objects.filter(name='Workshops').exists())
+        self.assertContains(response, 'Workshops')
+        self.assertEqual(len(list(response.context['messages'])), 1)
+        self.assertFalse(any('django_session' in query['sql'] for query in captured.captured_queries))
+
+
+class CacheBackendTests(EventTestCase):
+    def test_redis_cache_client_imports(self):
+        # Setting REDIS_URL selects this backend; creating its client
+        # imports redis-py, which must be installed
+        from django.core.cache.backends.redis import RedisCache
+
+        client = RedisCache('redis://127.0.0.1:6379/0', {})._cache
+        self.assertEqual(client._servers, ['redis://127.0.0.1:6379/0'])
+
+
+class SessionBenchmarkTests(EventTestCase):
+    def test_benchmark_reports_each_profile_and_rolls_back(self):
+        out = StringIO()
+        call_command('benchmark_session_writes', rounds=1, stdout=out)
+
+        rows = {line.split()[0]: line.split()[1:] for line in out.getvalue().splitlines()[1:]}
+        self.assertEqual(set(rows), {'db', 'cookie', 'cache'})
+        self.assertNotEqual(rows['db'][2], '0.0')
+        self.assertEqual((rows['cookie'][2], rows['cache'][2]), ('0.0', '0.0'))
+        self.assertFalse(Category.objects.exists())
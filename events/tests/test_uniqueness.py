@@ -0,0 +1,41 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from events.models import Category, Participant
+
+from .base import EventTestCase
+
+
+class CaseInsensitiveUniquenessTests(EventTestCase):
+    def test_duplicate_category_name_is_a_form_error(self):
+        self.make_category('Tech')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('category_create'), {'name': 'TECH', 'description': 'Again'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(response.context['form'], 'name', 'A category with this name already exists.')
+        self.assertEqual(Category.objects.count(), 1)
+        # No pre-check query: the INSERT itself is rejected
+        self.assertFalse(any('SELECT 1 AS "a"' in query['sql'] for query in queries))
+
+    def test_duplicate_participant_email_is_a_form_error(self):
+        self.make_participant('ada@example.com')
+        grace = self.make_participant('grace@example.com', 'Grace')
+
+        response = self.client.post(
+            reverse('participant_update', args=[grace.pk]), {'name': 'Grace', 'email': 'ADA@example.com'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(response.context['form'], 'email', 'A participant with this email already exists.')
+        self.assertEqual(Participant.objects.get(pk=grace.pk).email, 'grace@example.com')
+
+    def test_distinct_names_save(self):
+        self.make_category('Tech')
+
+        response = self.client.post(reverse('category_create'), {'name': 'Technology', 'description': 'Talks'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Category.objects.count(), 2)
@@ -0,0 +1,17 @@
+from django.test import SimpleTestCase
+
+from events import warmup
+
+
+class WarmupTests(SimpleTestCase):
+    def test_template_names_include_pages_and_email_bodies(self):
+        names = warmup.template_names()
+
+        self.assertEqual(names[0], 'base.html')
+        self.assertIn('events/event_list.html', names)
+        self.assertIn('events/email/event_changed.txt', names)
+        self.assertIn('events/email/event_cancelled.txt', names)
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_compile_templates_loads_every_template(self):
+        warmup.compile_templates()
@@ -2,11 +2,21 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
-    # Health check
+    # Health checks and metrics
     path('health/', views.health_check, name='health_check'),
+    path('health/live/', views.health_check, name='health_live'),
+    path('health/ready/', views.readiness_check, name='health_ready'),
+    path('metrics/', views.metrics, name='metrics'),
+    
+    # Background delete progress
+    path('jobs/deletions/<int:pk>/', views.deletion_job_status, name='deletion_job_status'),
+    
+    # Incremental change feed
+    path('api/changes/', views.change_feed, name='change_feed'),
     
     # Dashboard
     path('', views.dashboard, name='dashboard'),
+    path('analytics/', views.analytics_data, name='analytics_data'),
     
     # Event URLs
     path('events/', views.EventListView.as_view(), name='event_list'),
@@ -14,6 +24,10 @@ urlpatterns = [
     path('events/create/', views.EventCreateView.as_view(), name='event_create'),
     path('events/<int:pk>/edit/', views.EventUpdateView.as_view(), name='event_update'),
     path('events/<int:pk>/delete/', views.EventDeleteView.as_view(), name='event_delete'),
+    path('events/feed.ics', views.event_feed, name='event_feed'),
+    path('events/suggest/', views.event_suggest, name='event_suggest'),
+    path('events/occurrences/', views.event_occurrences, name='event_occurrences'),
+    path('events/<int:pk>/occurrences/register/', views.occurrence_register, name='occurrence_register'),
     
     # Category URLs
     path('categories/', views.CategoryListView.as_view(), name='category_list'),
@@ -21,6 +35,7 @@ urlpatterns = [
     path('categories/create/', views.CategoryCreateView.as_view(), name='category_create'),
     path('categories/<int:pk>/edit/', views.CategoryUpdateView.as_view(), name='category_update'),
     path('categories/<int:pk>/delete/', views.CategoryDeleteView.as_view(), name='category_delete'),
+    path('categories/<int:pk>/feed.ics', views.category_feed, name='category_feed'),
     
     # Participant URLs
     path('participants/', views.ParticipantListView.as_view(), name='participant_list'),
@@ -28,4 +43,5 @@ urlpatterns = [
     path('participants/create/', views.ParticipantCreateView.as_view(), name='participant_create'),
     path('participants/<int:pk>/edit/', views.ParticipantUpdateView.as_view(), name='participant_update'),
     path('participants/<int:pk>/delete/', views.ParticipantDeleteView.as_view(), name='participant_delete'),
+    path('participants/<int:pk>/feed.ics', views.participant_feed, name='participant_feed'),
 ]
@@ -1,35 +1,225 @@
+import logging
+from datetime import timedelta
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
-from django.db.models import Count, Q
+from django.db.models import Count, Prefetch, Q
 from django.utils import timezone
 from django.urls import reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.core.paginator import Paginator
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.core.cache import cache
+from django.views.decorators.http import condition, require_POST
 from django.conf import settings
-from .models import Category, Event, Participant
-from .forms import CategoryForm, EventForm, ParticipantForm, EventSearchForm
+from django.db import DatabaseError, IntegrityError, transaction
+from . import analytics, outbox, recurrence, search
+from .archive import ArchiveAwareResults, archived_totals, reaches_archive
+from .deletion import category_delete_counts, delete_category, delete_event, needs_background_delete
+from .feeds import feed_etag, feed_last_modified, iter_calendar
+from .health import cached_counts, readiness
+from .models import ArchivedEvent, Category, DeletionJob, Event, OccurrenceRegistration, Participant, day_bounds
+from .notifications import NOTIFY_FIELDS, enqueue_cancellation, enqueue_change
+from .forms import (
+    AnalyticsFilterForm, CategoryForm, ChangeFeedForm, EventForm, ParticipantForm, EventSearchForm,
+    OccurrenceFilterForm, OccurrenceRegistrationForm,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Health check endpoints
+def health_check(request):
+    """Liveness probe: the process is up and serving, no database work"""
+    return JsonResponse({
+        'status': 'healthy',
+        'debug': getattr(settings, 'DEBUG', False)
+    })
 
 
-# Health check endpoint
-def health_check(request):
-    """Simple health check to verify the app is working"""
+def readiness_check(request):
+    """Readiness probe: cached SELECT 1 round-trip and migration state"""
+    result = readiness()
+    return JsonResponse(result, status=200 if result['status'] == 'ready' else 503)
+
+
+def metrics(request):
+    """Event and participant totals from the cached counts"""
+    return JsonResponse(cached_counts())
+
+
+def deletion_job_status(request, pk):
+    """Progress of a background delete, for polling from the UI"""
+    job = get_object_or_404(DeletionJob, pk=pk)
+    return JsonResponse({
+        'target': job.target,
+        'label': job.label,
+        'status': job.status,
+        'deleted': job.deleted,
+        'total': job.total,
+        'progress': job.progress,
+        'error': job.error,
+    })
+
+
+def change_feed(request):
+    """Changes after a cursor, oldest first: ?since=<cursor>&limit=&entity=
+    
+    Pass the returned ``next`` back as ``since`` to resume; ``has_more``
+    means another page is already waiting.
+    """
+    form = ChangeFeedForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    since = form.cleaned_data.get('since') or 0
+    limit = form.cleaned_data.get('limit') or 500
+    entries = outbox.changes_since(since, limit, form.cleaned_data.get('entity'))
+    return JsonResponse({
+        'changes': [outbox.serialize(entry) for entry in entries],
+        'next': entries[-1].pk if entries else since,
+        'has_more': len(entries) == limit,
+    })
+
+
+def event_suggest(request):
+    """Type-ahead suggestions for event names and locations: ?q=<prefix>"""
+    query = request.GET.get('q', '')[:200]
     try:
-        # Test database connection
-        db_status = "OK"
-        count = Event.objects.count()
-        
-        return JsonResponse({
-            'status': 'healthy',
-            'database': db_status,
-            'event_count': count,
-            'debug': getattr(settings, 'DEBUG', False)
-        })
-    except Exception as e:
-        return JsonResponse({
-            'status': 'error',
-            'error': str(e)
-        }, status=500)
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 25)
+    except ValueError:
+        limit = 10
+    return JsonResponse({'query': query, 'suggestions': search.suggest(query, limit)})
+
+
+# iCalendar feeds
+def _calendar_response(request, scope, pk, build):
+    """Serve a feed body from the cache, or stream it while caching it"""
+    body_key = f'ics:body:{feed_etag(scope, pk)}'
+    body = cache.get(body_key)
+    if body is not None:
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    else:
+        queryset, name = build()
+        response = StreamingHttpResponse(
+            iter_calendar(queryset, name, body_key), content_type='text/calendar; charset=utf-8'
+        )
+    response['Content-Disposition'] = f'inline; filename="{scope}.ics"'
+    return response
+
+
+@condition(etag_func=lambda request: feed_etag('all'),
+           last_modified_func=lambda request: feed_last_modified('all'))
+def event_feed(request):
+    """All events as an .ics feed"""
+    return _calendar_response(request, 'all', None, lambda: (Event.objects.all(), 'All Events'))
+
+
+@condition(etag_func=lambda request, pk: feed_etag('category', pk),
+           last_modified_func=lambda request, pk: feed_last_modified('category', pk))
+def category_feed(request, pk):
+    """Events in one category as an .ics feed"""
+    def build():
+        category = get_object_or_404(Category.objects.only('name'), pk=pk)
+        return Event.objects.filter(category_id=pk), category.name
+    return _calendar_response(request, 'category', pk, build)
+
+
+@condition(etag_func=lambda request, pk: feed_etag('participant', pk),
+           last_modified_func=lambda request, pk: feed_last_modified('participant', pk))
+def participant_feed(request, pk):
+    """A participant's registered events as an .ics feed"""
+    def build():
+        participant = get_object_or_404(Participant.objects.only('name'), pk=pk)
+        event_ids = Event.participants.through.objects.filter(participant_id=pk).values('event_id')
+        return Event.objects.filter(id__in=event_ids), f'{participant.name} - Events'
+    return _calendar_response(request, 'participant', pk, build)
+
+
+def event_occurrences(request):
+    """Events and expanded recurring occurrences in a window:
+    ?start=&end=&category=&near_lat=&near_lng=&radius_km="""
+    form = OccurrenceFilterForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    start = form.cleaned_data.get('start') or timezone.localdate()
+    end = form.cleaned_data.get('end') or start + timedelta(days=recurrence.window_days())
+    # Bound the expansion an open-ended series can cost per request
+    end = min(end, start + timedelta(days=recurrence.MAX_WINDOW_DAYS))
+    window_start, window_end = day_bounds(start)[0], day_bounds(end)[1]
+    
+    queryset = Event.objects.select_related('category')
+    if form.cleaned_data.get('category'):
+        queryset = queryset.filter(category_id=form.cleaned_data['category'])
+    if form.cleaned_data.get('near_lat') is not None:
+        queryset = queryset.near(
+            form.cleaned_data['near_lat'], form.cleaned_data['near_lng'], form.cleaned_data['radius_km']
+        )
+    one_off = queryset.filter(recurrence_rule='', starts_at__gte=window_start, starts_at__lt=window_end)
+    results = recurrence.OccurrenceMergeResults(
+        one_off.order_by('starts_at'),
+        recurrence.expand(recurrence.series_in_window(queryset, window_start, window_end), window_start, window_end),
+    )
+    limit = 500
+    return JsonResponse({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'count': results.count(),
+        'occurrences': [
+            {
+                'event_id': item.pk,
+                'name': item.name,
+                'starts_at': item.starts_at.isoformat(),
+                'location': item.location,
+                'latitude': item.latitude,
+                'longitude': item.longitude,
+                'distance_km': getattr(item, 'distance_km', None),
+                'category': item.category.name,
+                'recurring': item.is_occurrence,
+                'url': request.build_absolute_uri(item.get_absolute_url()),
+            }
+            for item in results[:limit]
+        ],
+    })
+
+
+@require_POST
+def occurrence_register(request, pk):
+    """Register a participant for one occurrence of a recurring event"""
+    event = get_object_or_404(Event.objects.exclude(recurrence_rule=''), pk=pk)
+    form = OccurrenceRegistrationForm(request.POST, event=event)
+    if form.is_valid():
+        _, created = OccurrenceRegistration.objects.get_or_create(
+            event=event, participant=form.participant, occurrence_start=form.cleaned_data['occurrence'],
+        )
+        when = timezone.localtime(form.cleaned_data['occurrence'])
+        if created:
+            messages.success(request, f'{form.participant.name} is registered for "{event.name}" on {when:%Y-%m-%d %H:%M}.')
+        else:
+            messages.info(request, f'{form.participant.name} is already registered for that occurrence.')
+    else:
+        for errors in form.errors.values():
+            messages.error(request, errors[0])
+    return redirect(event)
+
+
+def analytics_data(request):
+    """Rollup-backed analytics: ?start=&end=&category=&group=day|week"""
+    form = AnalyticsFilterForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    start = form.cleaned_data.get('start')
+    end = form.cleaned_data.get('end')
+    category_id = form.cleaned_data.get('category')
+    group = form.cleaned_data.get('group') or 'day'
+    
+    return JsonResponse({
+        'group': group,
+        'series': [
+            dict(row, period=row['period'].isoformat())
+            for row in analytics.series(start, end, category_id, group)
+        ],
+        'categories': analytics.category_totals(start, end),
+    })
 
 
 # Dashboard View (Section 4.3)
@@ -41,25 +231,32 @@ def dashboard(request):
             total=Count('id')
         )['total'] or 0
         
-        total_events = Event.objects.count()
-        
-        # Upcoming and past events
-        today = timezone.now().date()
-        upcoming_events = Event.objects.filter(date__gte=today).count()
-        past_events = Event.objects.filter(date__lt=today).count()
+        # One pass over the starts_at index for all three event totals
+        now = timezone.now()
+        event_totals = Event.objects.aggregate(
+            total=Count('id'),
+            upcoming=Count('id', filter=Q(starts_at__gte=now)),
+            past=Count('id', filter=Q(starts_at__lt=now)),
+        )
+        # Archived events are counted from the rollup, never the archive table
+        archived_events = archived_totals()['events']
+        total_events = event_totals['total'] + archived_events
+        upcoming_events = event_totals['upcoming']
+        past_events = event_totals['past'] + archived_events
         
         # Today's events
-        today_events = Event.objects.filter(date=today).select_related('category').prefetch_related('participants')
+        events_with_status = Event.objects.with_status(now).select_related('category').prefetch_related('participants')
+        today_events = events_with_status.on_day(timezone.localdate(now))
         
         # Filter for interactive stats
         filter_type = request.GET.get('filter', 'all')
         if filter_type == 'upcoming':
-            events = Event.objects.filter(date__gte=today).select_related('category').prefetch_related('participants')
+            events = events_with_status.upcoming(now)
         elif filter_type == 'past':
-            events = Event.objects.filter(date__lt=today).select_related('category').prefetch_related('participants')
+            events = events_with_status.past(now)
         else:
-            events = Event.objects.all().select_related('category').prefetch_related('participants')
-    except Exception as e:
+            events = events_with_status
+    except Exception:
         # Handle database errors gracefully
         total_participants = 0
         total_events = 0
@@ -68,10 +265,20 @@ def dashboard(request):
         today_events = []
         events = []
         filter_type = 'all'
-        # Log the error for debugging
-        print(f"Dashboard error: {e}")
+        logger.exception('Dashboard stats failed')
+    
+    try:
+        # Charts read only the DailyCategoryStats rollup
+        registration_activity = analytics.recent_activity()
+        category_stats = analytics.category_totals()
+    except DatabaseError:
+        registration_activity = []
+        category_stats = []
+        logger.exception('Dashboard analytics failed')
     
     context = {
+        'registration_activity': registration_activity,
+        'category_stats': category_stats,
         'total_participants': total_participants,
         'total_events': total_events,
         'upcoming_events': upcoming_events,
@@ -102,6 +309,23 @@ def dashboard(request):
 
 
 # Event Views (Section 2.1 & 3)
+class ConstraintSaveMixin:
+    """Save a model form straight away and let the database's unique
+    constraints reject duplicates, shown as the form's own errors"""
+    success_message = ''
+
+    def form_valid(self, form):
+        try:
+            with transaction.atomic():
+                response = super().form_valid(form)
+        except IntegrityError as e:
+            if not form.add_constraint_error(e):
+                raise
+            return self.form_invalid(form)
+        messages.success(self.request, self.success_message.format(name=self.object.name))
+        return response
+
+
 class EventListView(ListView):
     """Event list view with optimized queries and search functionality"""
     model = Event
@@ -111,38 +335,77 @@ class EventListView(ListView):
 
     def get_queryset(self):
         # Section 3.1 - select_related usage for optimization
-        queryset = Event.objects.select_related('category').prefetch_related('participants')
+        queryset = Event.objects.with_status().select_related('category').prefetch_related('participants')
         
-        # Section 5 - Search functionality
-        form = EventSearchForm(self.request.GET)
+        # Section 5 - Search functionality; built once and reused by the template
+        self.search_form = form = EventSearchForm(self.request.GET)
         if form.is_valid():
-            search_query = form.cleaned_data.get('search_query')
-            category = form.cleaned_data.get('category')
-            date_from = form.cleaned_data.get('date_from')
-            date_to = form.cleaned_data.get('date_to')
-            
-            if search_query:
-                # Section 5.2 - icontains lookup for case-insensitive search
-                queryset = queryset.filter(
-                    Q(name__icontains=search_query) | 
-                    Q(location__icontains=search_query)
-                )
-            
-            if category:
-                queryset = queryset.filter(category=category)
-            
-            # Section 3.4 - Date range filter
-            if date_from:
-                queryset = queryset.filter(date__gte=date_from)
-            if date_to:
-                queryset = queryset.filter(date__lte=date_to)
+            data = form.cleaned_data
+            if data.get('date_from') or data.get('date_to'):
+                # A date window lists each occurrence of recurring series in it
+                queryset = self.with_occurrences(queryset, data)
+            else:
+                queryset = self.filter_events(queryset, data).order_by('starts_at')
+            # Only date filters overlapping archived days touch the archive
+            if reaches_archive(data.get('date_from'), data.get('date_to')):
+                archived = ArchivedEvent.objects.select_related('category').prefetch_related('participants')
+                archived = self.filter_events(archived, data)
+                return ArchiveAwareResults(archived.order_by('starts_at'), queryset)
+            return queryset
+        
+        return queryset.order_by('starts_at')
+
+    @classmethod
+    def with_occurrences(cls, queryset, cleaned_data):
+        date_from, date_to = cleaned_data.get('date_from'), cleaned_data.get('date_to')
+        window_start = day_bounds(date_from)[0] if date_from else timezone.now()
+        if date_to:
+            window_end = day_bounds(date_to)[1]
+        else:
+            window_end = window_start + timedelta(days=recurrence.window_days())
+        # One-off events cover the whole range; series are expanded for at
+        # most MAX_WINDOW_DAYS of it
+        window_end = recurrence.capped_window_end(window_start, window_end)
+        series = recurrence.series_in_window(
+            cls.filter_events(queryset, cleaned_data, dates=False), window_start, window_end
+        )
+        one_off = cls.filter_events(queryset.filter(recurrence_rule=''), cleaned_data)
+        return recurrence.OccurrenceMergeResults(
+            one_off.order_by('starts_at'), recurrence.expand(series, window_start, window_end)
+        )
+
+    @staticmethod
+    def filter_events(queryset, cleaned_data, dates=True):
+        search_query = cleaned_data.get('search_query')
+        category = cleaned_data.get('category')
+        
+        if search_query:
+            # Section 5.2 - icontains lookup for case-insensitive search
+            queryset = queryset.filter(
+                Q(name__icontains=search_query) | 
+                Q(location__icontains=search_query)
+            )
         
-        return queryset.order_by('date', 'time')
+        if category:
+            queryset = queryset.filter(category=category)
+        
+        if cleaned_data.get('near_lat') is not None:
+            # Geohash cell prefixes prune candidates before exact distances
+            queryset = queryset.near(cleaned_data['near_lat'], cleaned_data['near_lng'], cleaned_data['radius_km'])
+        
+        if not dates:
+            return queryset
+        # Section 3.4 - Date range filter on the starts_at index
+        return queryset.in_date_range(cleaned_data.get('date_from'), cleaned_data.get('date_to'))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['search_form'] = EventSearchForm(self.request.GET)
+        context['search_form'] = self.search_form
         context['search_query'] = self.request.GET.get('search_query', '')
+        # Pagination links keep every active filter
+        query = self.request.GET.copy()
+        query.pop('page', None)
+        context['page_query'] = query.urlencode()
         return context
 
 
@@ -154,7 +417,16 @@ class EventDetailView(DetailView):
 
     def get_queryset(self):
         # Section 3.2 - prefetch_related for participants
-        return Event.objects.select_related('category').prefetch_related('participants')
+        return Event.objects.with_status().select_related('category').prefetch_related('participants')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.object.is_recurring:
+            now = timezone.now()
+            occurrences = self.object.occurrences(now, now + timedelta(days=recurrence.window_days()))
+            context['occurrences'] = occurrences[:10]
+            context['occurrence_form'] = OccurrenceRegistrationForm(event=self.object)
+        return context
 
 
 class EventCreateView(CreateView):
@@ -175,8 +447,12 @@ class EventUpdateView(UpdateView):
     template_name = 'events/event_form.html'
 
     def form_valid(self, form):
+        response = super().form_valid(form)
+        # Attendees are emailed by the send_notifications worker, not here
+        if NOTIFY_FIELDS & set(form.changed_data):
+            enqueue_change(self.object)
         messages.success(self.request, f'Event "{form.instance.name}" was updated successfully!')
-        return super().form_valid(form)
+        return response
 
 
 class EventDeleteView(DeleteView):
@@ -185,10 +461,28 @@ class EventDeleteView(DeleteView):
     template_name = 'events/event_confirm_delete.html'
     success_url = reverse_lazy('event_list')
 
-    def delete(self, request, *args, **kwargs):
-        event_name = self.get_object().name
-        messages.success(request, f'Event "{event_name}" was deleted successfully!')
-        return super().delete(request, *args, **kwargs)
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['participant_count'] = Event.participants.through.objects.filter(event_id=self.object.pk).count()
+        return context
+
+    def form_valid(self, form):
+        # Chunked delete instead of the Collector's all-in-memory cascade.
+        # The cancellation notice keeps its own copy of the registrants.
+        event = self.object
+        participant_ids = list(
+            Event.participants.through.objects.filter(event_id=event.pk).values_list('participant_id', flat=True)
+        )
+        enqueue_cancellation(event, participant_ids)
+        if needs_background_delete(len(participant_ids)):
+            DeletionJob.objects.create(
+                target=DeletionJob.EVENT, target_id=event.pk, label=event.name, total=len(participant_ids)
+            )
+            messages.info(self.request, f'Event "{event.name}" is being deleted in the background.')
+        else:
+            delete_event(event.pk)
+            messages.success(self.request, f'Event "{event.name}" was deleted successfully!')
+        return redirect(self.get_success_url())
 
 
 # Category Views (Section 2.3)
@@ -212,30 +506,24 @@ class CategoryDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Get events in this category with optimized queries
-        context['events'] = Event.objects.filter(category=self.object).select_related('category').prefetch_related('participants').order_by('date', 'time')
+        context['events'] = Event.objects.with_status().filter(category=self.object).select_related('category').prefetch_related('participants').order_by('starts_at')
         return context
 
 
-class CategoryCreateView(CreateView):
+class CategoryCreateView(ConstraintSaveMixin, CreateView):
     """Category create view"""
     model = Category
     form_class = CategoryForm
     template_name = 'events/category_form.html'
+    success_message = 'Category "{name}" was created successfully!'
 
-    def form_valid(self, form):
-        messages.success(self.request, f'Category "{form.instance.name}" was created successfully!')
-        return super().form_valid(form)
 
-
-class CategoryUpdateView(UpdateView):
+class CategoryUpdateView(ConstraintSaveMixin, UpdateView):
     """Category update view"""
     model = Category
     form_class = CategoryForm
     template_name = 'events/category_form.html'
-
-    def form_valid(self, form):
-        messages.success(self.request, f'Category "{form.instance.name}" was updated successfully!')
-        return super().form_valid(form)
+    success_message = 'Category "{name}" was updated successfully!'
 
 
 class CategoryDeleteView(DeleteView):
@@ -244,10 +532,28 @@ class CategoryDeleteView(DeleteView):
     template_name = 'events/category_confirm_delete.html'
     success_url = reverse_lazy('category_list')
 
-    def delete(self, request, *args, **kwargs):
-        category_name = self.get_object().name
-        messages.success(request, f'Category "{category_name}" was deleted successfully!')
-        return super().delete(request, *args, **kwargs)
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(category_delete_counts(self.object.pk))
+        context['preview_events'] = Event.objects.filter(category=self.object).only('name', 'date')[:5]
+        return context
+
+    def form_valid(self, form):
+        # Chunked delete instead of the Collector's all-in-memory cascade
+        category = self.object
+        event_count = (
+            Event.objects.filter(category=category).count()
+            + ArchivedEvent.objects.filter(category=category).count()
+        )
+        if needs_background_delete(event_count):
+            DeletionJob.objects.create(
+                target=DeletionJob.CATEGORY, target_id=category.pk, label=category.name, total=event_count
+            )
+            messages.info(self.request, f'Category "{category.name}" is being deleted in the background.')
+        else:
+            delete_category(category.pk)
+            messages.success(self.request, f'Category "{category.name}" was deleted successfully!')
+        return redirect(self.get_success_url())
 
 
 # Participant Views (Section 2.2)
@@ -259,7 +565,9 @@ class ParticipantListView(ListView):
     paginate_by = 12
 
     def get_queryset(self):
-        return Participant.objects.prefetch_related('events').order_by('name')
+        return Participant.objects.prefetch_related(
+            Prefetch('events', queryset=Event.objects.with_status())
+        ).order_by('name')
 
 
 class ParticipantDetailView(DetailView):
@@ -269,29 +577,25 @@ class ParticipantDetailView(DetailView):
     context_object_name = 'participant'
 
     def get_queryset(self):
-        return Participant.objects.prefetch_related('events__category')
+        return Participant.objects.prefetch_related(
+            Prefetch('events', queryset=Event.objects.with_status().select_related('category'))
+        )
 
 
-class ParticipantCreateView(CreateView):
+class ParticipantCreateView(ConstraintSaveMixin, CreateView):
     """Participant create view"""
     model = Participant
     form_class = ParticipantForm
     template_name = 'events/participant_form.html'
-
-    def form_valid(self, form):
-        messages.success(self.request, f'Participant "{form.instance.name}" was created successfully!')
-        return super().form_valid(form)
+    success_message = 'Participant "{name}" was created successfully!'
 
 
-class ParticipantUpdateView(UpdateView):
+class ParticipantUpdateView(ConstraintSaveMixin, UpdateView):
     """Participant update view"""
     model = Participant
     form_class = ParticipantForm
     template_name = 'events/participant_form.html'
-
-    def form_valid(self, form):
-        messages.success(self.request, f'Participant "{form.instance.name}" was updated successfully!')
-        return super().form_valid(form)
+    success_message = 'Participant "{name}" was updated successfully!'
 
 
 class ParticipantDeleteView(DeleteView):
@@ -300,7 +604,6 @@ class ParticipantDeleteView(DeleteView):
     template_name = 'events/participant_confirm_delete.html'
     success_url = reverse_lazy('participant_list')
 
-    def delete(self, request, *args, **kwargs):
-        participant_name = self.get_object().name
-        messages.success(request, f'Participant "{participant_name}" was deleted successfully!')
-        return super().delete(request, *args, **kwargs)
+    def form_valid(self, form):
+        messages.success(self.request, f'Participant "{self.object.name}" was deleted successfully!')
+        return super().form_valid(form)
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+
+from . import refdata
+
+
+TEMPLATE_PATTERNS = ['**/*.html', '**/*.txt']
+
+def template_names():
+    """Every template under templates/events/ (pages and email bodies) and
+    the base they extend"""
+    root = settings.BASE_DIR / 'templates'
+    paths = [path for pattern in TEMPLATE_PATTERNS for path in (root / 'events').glob(pattern)]
+    return ['base.html'] + sorted(path.relative_to(root).as_posix() for path in paths)
+
+
+def compile_templates():
+    # The cached loader keeps the compiled Template for the process's lifetime
+    for name in template_names():
+        get_template(name)
+
+
+def prime_urls():
+    """Import the URLconf and views and build the reverse() lookup tables"""
+    get_resolver().reverse_dict
+    reverse('dashboard')
+
+
+def prime_caches():
+    refdata.categories()
+
+
+def connect_databases():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+STAGES = [
+    ('templates', compile_templates),
+    ('urls', prime_urls),
+    ('reference data', prime_caches),
+]
+
+
+def warm_up():
+    """Do the first-request work up front. Safe to call before forking:
+    connections opened on the way are closed again so no worker inherits
+    a database handle from the master."""
+    for _, stage in STAGES:
+        stage()
+    connections.close_all()
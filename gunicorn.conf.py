@@ -0,0 +1,42 @@
+# Gunicorn reads this file from the working directory. The master imports
+# the app and warms it up once; workers fork from it, so a new or recycled
+# worker does not pay for imports, template compilation or URL resolution
+# on its first request.
+
+import os
+import subprocess
+import sys
+
+preload_app = True
+
+MANAGE_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manage.py')
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from events.warmup import warm_up
+        warm_up()
+        server.log.info('Application warmed up before forking workers')
+    # The SQLite database lives on this service's disk, so queued jobs and
+    # the daily archive/compaction run beside the web workers. Set
+    # BACKGROUND_JOBS=False if they run elsewhere against a shared database.
+    if os.environ.get('BACKGROUND_JOBS', 'True') == 'True':
+        server.background_jobs = subprocess.Popen([sys.executable, MANAGE_PY, 'run_background_jobs'])
+        server.log.info('Started background jobs (pid %s)', server.background_jobs.pid)
+
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        from events.warmup import warm_up
+        warm_up()
+    # Connections are per process (and per thread), so open them only
+    # after the fork; CONN_MAX_AGE keeps them for the first request
+    from events.warmup import connect_databases
+    connect_databases()
+
+
+def on_exit(server):
+    jobs = getattr(server, 'background_jobs', None)
+    if jobs and jobs.poll() is None:
+        jobs.terminate()
+        jobs.wait(timeout=30)
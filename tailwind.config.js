@@ -0,0 +1,22 @@
+/** Tailwind build config: only classes found in these files end up in static/css/app.css */
+module.exports = {
+  content: [
+    './templates/**/*.html',
+    // Widget attrs in forms.py and MESSAGE_TAGS in settings.py carry classes too
+    './events/**/*.py',
+    './event_management/settings.py',
+  ],
+  theme: {
+    extend: {
+      colors: {
+        primary: {
+          50: '#eff6ff',
+          500: '#3b82f6',
+          600: '#2563eb',
+          700: '#1d4ed8',
+        },
+      },
+    },
+  },
+  plugins: [],
+}